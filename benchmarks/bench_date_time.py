@@ -0,0 +1,118 @@
+"""
+Micro-benchmark and fuzz check for date and time formatting.
+
+Checks that format_date/format_time give exactly the same results as the
+original strptime/strftime implementations on a fuzzed corpus of valid,
+out-of-range and malformed strings, then compares per-row cost on a
+realistic export (a couple of dates and a few dozen time windows).
+
+Usage:
+    python benchmarks/bench_date_time.py [--fuzz 200000] [--rows 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workwave_to_doordash import WorkWaveToDoorDashConverter  # noqa: E402
+
+FUZZ_CHARACTERS = "0123456789/: APMapm\t-١"
+
+
+def original_format_date(date_str):
+    """format_date as it was before the fast path and memo table."""
+    if not date_str or date_str.strip() == "":
+        return ""
+    try:
+        return datetime.strptime(date_str, "%m/%d/%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return date_str
+
+
+def original_format_time(time_str):
+    """format_time as it was before the fast path and memo table."""
+    if not time_str or time_str.strip() == "":
+        return ""
+    try:
+        return datetime.strptime(time_str, "%I:%M %p").strftime("%H:%M:%S")
+    except ValueError:
+        return time_str
+
+
+def mutate(shape):
+    """Fill a shape like 'dd/dd/dddd' with digits, randomly dropping and inserting characters."""
+    out = []
+    for character in shape:
+        roll = random.random()
+        if roll < 0.05:
+            continue
+        if roll < 0.1:
+            out.append(random.choice(FUZZ_CHARACTERS))
+            continue
+        out.append(random.choice("0123456789") if character == 'd' else character)
+        if random.random() < 0.03:
+            out.append(random.choice(FUZZ_CHARACTERS))
+    return ''.join(out)
+
+
+def fuzz_corpus(size):
+    """Return (dates, times) mixing well-formed, out-of-range and mutated strings."""
+    dates = []
+    times = []
+    for index in range(size):
+        if index % 2:
+            dates.append(mutate('dd/dd/dddd'))
+            times.append(mutate('dd:dd AM'))
+        else:
+            dates.append('%02d/%02d/%04d' % (random.randint(0, 13), random.randint(0, 32),
+                                             random.choice([2024, 2025, 2000, 1900, 999, 0])))
+            times.append('%02d:%02d %s' % (random.randint(0, 13), random.randint(0, 60),
+                                           random.choice(['AM', 'PM', 'am', 'pm', 'XM'])))
+    return dates, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and fuzz date/time formatting.")
+    parser.add_argument('--fuzz', type=int, default=200000, help="Number of fuzzed strings (default: 200000)")
+    parser.add_argument('--rows', type=int, default=50000, help="Rows per timing run (default: 50000)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    converter = WorkWaveToDoorDashConverter()
+
+    dates, times = fuzz_corpus(args.fuzz)
+    mismatches = 0
+    for date_str in dates:
+        if converter.format_date(date_str) != original_format_date(date_str):
+            print(f"MISMATCH date {date_str!r}")
+            mismatches += 1
+    for time_str in times:
+        if converter.format_time(time_str) != original_format_time(time_str):
+            print(f"MISMATCH time {time_str!r}")
+            mismatches += 1
+    print(f"fuzz: {len(dates) + len(times)} strings, {mismatches} mismatches")
+    if mismatches:
+        return 1
+
+    # A realistic export: two dates and a few dozen time windows
+    export_dates = [random.choice(['09/02/2025', '09/03/2025']) for _ in range(args.rows)]
+    export_times = [f"{random.randint(1, 12):02d}:{random.choice(['00', '15', '30', '45'])} "
+                    f"{random.choice(['AM', 'PM'])}" for _ in range(args.rows)]
+    benchmarks = [
+        ("format_date", original_format_date, converter.format_date, export_dates),
+        ("format_time", original_format_time, converter.format_time, export_times),
+    ]
+    for label, before, after, values in benchmarks:
+        before_cost = min(timeit.repeat(lambda: [before(value) for value in values], number=1, repeat=3))
+        after_cost = min(timeit.repeat(lambda: [after(value) for value in values], number=1, repeat=3))
+        print(f"{label:12s} before {before_cost / len(values) * 1e6:6.2f} us/row   "
+              f"after {after_cost / len(values) * 1e6:6.2f} us/row   speedup {before_cost / after_cost:5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
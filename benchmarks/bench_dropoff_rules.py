@@ -0,0 +1,125 @@
+"""
+Micro-benchmark for dropoff note cleanup and address parsing.
+
+Compares the per-row cost of the original implementations (three inline
+re.sub calls and two .lower() copies per note, re.search with an inline
+pattern per address) against the current precompiled versions in
+WorkWaveToDoorDashConverter, and checks that both produce the same results.
+
+Usage:
+    python benchmarks/bench_dropoff_rules.py [--rows 20000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workwave_to_doordash import WorkWaveToDoorDashConverter  # noqa: E402
+
+STANDARD_NOTE = "Please deliver directly to the client. Do not leave unattended unless client has provided a cooler."
+
+SAMPLE_NOTES = [
+    "",
+    "Call CS for issues.",
+    "Gate code 1234. Please deliver after 3:30 PM.",
+    "Leave at door  please",
+    "Ring bell twice, dog in yard. Call CS for any issues",
+    "please deliver after 5 Knock loudly",
+    STANDARD_NOTE,
+    "Building B, 2nd floor.\nUse side entrance. " * 8,
+]
+
+SAMPLE_ADDRESSES = [
+    "123 Main St, Los Angeles, CA 90001",
+    "55 Elm, Pasadena, CA 91101-1234",
+    '"77 Pine Ave, Burbank, CA 91502"',
+    "PO Box 4, Nowhere",
+    "9 Oak Ave, Glendale, ca 91201",
+]
+
+
+def original_process_dropoff_instructions(converter, notes):
+    """The note cleanup as it was before the rules were precompiled."""
+    if not notes or notes.strip() == "":
+        return converter.default_dropoff_instructions
+    notes = notes.strip('"')
+    notes = re.sub(r"Call CS for (any )?issues\.?", "", notes, flags=re.IGNORECASE)
+    notes = re.sub(r"Please deliver after \d+(\:\d+)?( [AP]M)?\.?", "", notes, flags=re.IGNORECASE)
+    notes = re.sub(r"\s+", " ", notes).strip()
+    if not notes:
+        notes = converter.default_dropoff_instructions
+    standard_note = STANDARD_NOTE
+    if standard_note.lower() not in notes.lower():
+        combined_notes = f"{notes} {standard_note}"
+        if len(combined_notes) > 250:
+            max_original_length = 250 - len(standard_note) - 4
+            notes = f"{notes[:max_original_length]}... {standard_note}"
+        else:
+            notes = combined_notes
+    return notes
+
+
+def original_parse_address(address):
+    """The address parsing as it was before the pattern was precompiled."""
+    if not address or address.strip() == "":
+        return "", "", "", ""
+    address = address.strip('"')
+    pattern = r"(.*?),\s*(.*?),\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)"
+    match = re.search(pattern, address)
+    if match:
+        return tuple(group.strip() for group in match.groups())
+    parts = address.split(',')
+    if len(parts) >= 3:
+        state_zip = parts[2].strip().split()
+        if len(state_zip) >= 2:
+            return parts[0].strip(), parts[1].strip(), state_zip[0].strip(), state_zip[1].strip()
+    return address, "", "", ""
+
+
+def per_row_cost(function, values, repeat):
+    """Return the best per-row cost of calling function on every value, in microseconds."""
+    timer = timeit.Timer(lambda: [function(value) for value in values])
+    return min(timer.repeat(repeat=repeat, number=1)) / len(values) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dropoff note cleanup and address parsing.")
+    parser.add_argument('--rows', type=int, default=20000, help="Number of rows per measurement (default: 20000)")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of repetitions (default: 5)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    converter = WorkWaveToDoorDashConverter()
+    notes = [random.choice(SAMPLE_NOTES) for _ in range(args.rows)]
+    addresses = [random.choice(SAMPLE_ADDRESSES) for _ in range(args.rows)]
+
+    # Both implementations must agree before timing them
+    for note in SAMPLE_NOTES:
+        if original_process_dropoff_instructions(converter, note) != converter.process_dropoff_instructions(note):
+            print(f"MISMATCH for note {note!r}")
+            return 1
+    for address in SAMPLE_ADDRESSES:
+        if original_parse_address(address) != converter.parse_address(address):
+            print(f"MISMATCH for address {address!r}")
+            return 1
+
+    benchmarks = [
+        ("process_dropoff_instructions",
+         lambda note: original_process_dropoff_instructions(converter, note),
+         converter.process_dropoff_instructions, notes),
+        ("parse_address", original_parse_address, converter.parse_address, addresses),
+    ]
+    for label, before, after, values in benchmarks:
+        before_cost = per_row_cost(before, values, args.repeat)
+        after_cost = per_row_cost(after, values, args.repeat)
+        print(f"{label:30s} before {before_cost:6.2f} us/row   after {after_cost:6.2f} us/row   "
+              f"speedup {before_cost / after_cost:4.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
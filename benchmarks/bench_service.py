@@ -0,0 +1,229 @@
+"""
+Exercise and benchmark the local HTTP conversion service.
+
+Starts ConversionService on a free localhost port and checks that POST /convert
+returns exactly the bytes convert_file writes when the upload is sent whole,
+split into random pieces (cutting through CRLFs and quoted multi-line notes),
+or with chunked transfer encoding. Also checks that a negative Content-Length
+is refused, that output starts streaming before the upload ends, that requests
+beyond --max-concurrent get 503 with Retry-After while the running conversion
+completes, and that /health counts them. Finally reports throughput with several concurrent uploads.
+
+Usage:
+    python benchmarks/bench_service.py [--rows 20000] [--trials 20] [--clients 4]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from generate_workwave import generate_workwave_csv  # noqa: E402
+from workwave_to_doordash import ConversionService, WorkWaveToDoorDashConverter  # noqa: E402
+
+
+def start_service(max_concurrent):
+    """Run a ConversionService on a free port in a background thread; return (service, loop)."""
+    loop = asyncio.new_event_loop()
+    service = ConversionService(WorkWaveToDoorDashConverter(), port=0, max_concurrent=max_concurrent)
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start())
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return service, loop
+
+
+def stop_service(service, loop):
+    """Close the server, let open connections finish and stop the loop."""
+    stopped = threading.Event()
+
+    async def shutdown():
+        service.server.close()
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        if tasks:
+            await asyncio.wait(tasks)
+        loop.stop()
+        stopped.set()
+    asyncio.run_coroutine_threadsafe(shutdown(), loop)
+    stopped.wait()
+
+
+def split(data, rng, max_piece):
+    """Split data into random pieces of 1 to max_piece bytes."""
+    pieces = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, max_piece)
+        pieces.append(data[pos:pos + size])
+        pos += size
+    return pieces
+
+
+def open_upload(port, length=None, path='/convert'):
+    """Connect and send the request head; a None length uses chunked transfer encoding."""
+    sock = socket.create_connection(('127.0.0.1', port))
+    framing = f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked"
+    sock.sendall(f"POST {path} HTTP/1.1\r\nHost: localhost\r\n{framing}\r\n\r\n".encode('latin-1'))
+    return sock
+
+
+def send_pieces(sock, pieces, chunked=False, pause=0.0):
+    """Send the body pieces, framed as chunks if chunked, then half-close the connection."""
+    for piece in pieces:
+        sock.sendall(b"%x\r\n%s\r\n" % (len(piece), piece) if chunked else piece)
+        if pause:
+            time.sleep(pause)
+    if chunked:
+        sock.sendall(b"0\r\n\r\n")
+    sock.shutdown(socket.SHUT_WR)
+
+
+def read_response(sock):
+    """Read a response until the server closes; return (status, headers, decoded body)."""
+    data = []
+    while True:
+        block = sock.recv(65536)
+        if not block:
+            break
+        data.append(block)
+    sock.close()
+    head, _, body = b''.join(data).partition(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    headers = {name.strip().lower(): value.strip()
+               for name, _, value in (line.partition(':') for line in lines[1:])}
+    if headers.get('transfer-encoding') == 'chunked':
+        decoded = []
+        while True:
+            size_line, _, body = body.partition(b"\r\n")
+            size = int(size_line, 16)
+            if size == 0:
+                break
+            decoded.append(body[:size])
+            body = body[size + 2:]
+        body = b''.join(decoded)
+    return int(lines[0].split()[1]), headers, body
+
+
+def post(port, pieces, chunked=False, pause=0.0):
+    """POST a body sent as pieces and return (status, headers, body)."""
+    sock = open_upload(port, None if chunked else sum(len(piece) for piece in pieces))
+    send_pieces(sock, pieces, chunked, pause)
+    return read_response(sock)
+
+
+def get(port, path):
+    """GET path and return the decoded JSON body."""
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    sock.shutdown(socket.SHUT_WR)
+    return json.loads(read_response(sock)[2])
+
+
+def check(label, ok, failures):
+    print(f"  {label:48s} {'ok' if ok else 'FAIL'}")
+    failures.append(not ok)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise and benchmark the local conversion service.")
+    parser.add_argument('--rows', type=int, default=20000, help="Rows in the synthetic export (default: 20000)")
+    parser.add_argument('--trials', type=int, default=20, help="Random split and chunked uploads (default: 20)")
+    parser.add_argument('--clients', type=int, default=4, help="Concurrent uploads for throughput (default: 4)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_file = os.path.join(work_dir, "workwave.csv")
+        output_file = os.path.join(work_dir, "doordash.csv")
+        generate_workwave_csv(input_file, args.rows, messy_notes_ratio=0.5, seed=args.seed)
+        WorkWaveToDoorDashConverter().convert_file(input_file, output_file)
+        with open(input_file, 'rb') as f:
+            upload = f.read()
+        with open(output_file, 'rb') as f:
+            expected = f.read()
+
+    service, loop = start_service(max_concurrent=max(1, args.clients))
+    port = service.port
+    print(f"service on port {port}, {len(upload) / 2 ** 20:.1f} MiB upload")
+
+    status, headers, body = post(port, [upload])
+    check("whole upload (Content-Length)", status == 200 and body == expected, failures)
+    split_ok = all(post(port, split(upload, rng, rng.choice([7, 512, 65536])))[2] == expected
+                   for _ in range(args.trials))
+    check(f"{args.trials} uploads split into random pieces", split_ok, failures)
+    chunked_ok = all(post(port, split(upload, rng, rng.choice([7, 512, 65536])), chunked=True)[2] == expected
+                     for _ in range(args.trials))
+    check(f"{args.trials} chunked uploads", chunked_ok, failures)
+
+    sock = open_upload(port, -1)
+    send_pieces(sock, [upload[:65536]])
+    status, headers, body = read_response(sock)
+    check("negative Content-Length gets 400", status == 400, failures)
+
+    # Output must start before the upload ends
+    sock = open_upload(port, len(upload))
+    half = len(upload) // 2
+    sock.sendall(upload[:half])
+    sock.settimeout(10)
+    first = sock.recv(65536)
+    sock.settimeout(None)
+    check("response starts before the upload ends", first.startswith(b"HTTP/1.1 200"), failures)
+    sock.sendall(upload[half:])
+    sock.shutdown(socket.SHUT_WR)
+    while sock.recv(65536):
+        pass
+    sock.close()
+    stop_service(service, loop)
+
+    # Requests beyond max_concurrent are turned away while the running one completes
+    service, loop = start_service(max_concurrent=1)
+    port = service.port
+    busy = open_upload(port, len(upload))
+    busy.sendall(upload[:half])
+    time.sleep(0.2)
+    status, headers, body = post(port, [upload])
+    check("503 with Retry-After at the concurrency limit", status == 503 and 'retry-after' in headers, failures)
+    send_pieces(busy, [upload[half:]])
+    status, headers, body = read_response(busy)
+    check("running conversion completes", status == 200 and body == expected, failures)
+    health = get(port, '/health')
+    check("/health counts the rejected request", health['rejected'] == 1 and health['requests'] == 1, failures)
+    stop_service(service, loop)
+
+    # Throughput with concurrent uploads
+    service, loop = start_service(max_concurrent=args.clients)
+    rounds = 3
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        results = list(executor.map(lambda _: post(service.port, [upload]), range(args.clients * rounds)))
+    seconds = time.perf_counter() - start
+    stop_service(service, loop)
+    check("concurrent uploads", all(status == 200 and body == expected for status, headers, body in results),
+          failures)
+    print(f"{args.clients * rounds} uploads with {args.clients} clients in {seconds:.2f}s: "
+          f"{len(upload) * len(results) / seconds / 2 ** 20:.1f} MiB/s, "
+          f"{args.rows * len(results) / seconds:,.0f} rows/s")
+
+    print("OK" if not any(failures) else f"FAIL: {sum(failures)} checks failed")
+    return 1 if any(failures) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
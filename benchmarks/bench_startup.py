@@ -0,0 +1,76 @@
+"""
+Measure cold start time of the WorkWave to DoorDash converter.
+
+Runs `python -m workwave_to_doordash --help` and a bare module import in fresh
+interpreters and reports the best and median wall time. Also checks that the
+import does not pull in tkinter or pandas.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--max-ms 500]
+
+Exits with status 1 if the median startup time exceeds --max-ms or if a lazy
+import is loaded eagerly, so it can be used to catch regressions.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_CHECK = (
+    "import sys, workwave_to_doordash; "
+    "eager = [name for name in ('tkinter', 'pandas') if name in sys.modules]; "
+    "print(','.join(eager))"
+)
+
+
+def time_command(command, runs):
+    """Run a command in fresh interpreters and return the wall times in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=REPO_DIR, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure converter startup time.")
+    parser.add_argument('--runs', type=int, default=10, help="Number of runs per measurement (default: 10)")
+    parser.add_argument('--max-ms', type=float, default=None, help="Fail if the median CLI startup exceeds this")
+    args = parser.parse_args()
+
+    failed = False
+
+    # Lazy imports must stay lazy
+    result = subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=REPO_DIR, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True)
+    eager = result.stdout.strip()
+    if eager:
+        print(f"FAIL: importing the module loads {eager}")
+        failed = True
+
+    measurements = [
+        ("python -c pass (interpreter baseline)", [sys.executable, '-c', 'pass']),
+        ("import workwave_to_doordash", [sys.executable, '-c', 'import workwave_to_doordash']),
+        ("python -m workwave_to_doordash --help", [sys.executable, '-m', 'workwave_to_doordash', '--help']),
+    ]
+    median_cli = None
+    for label, command in measurements:
+        timings = time_command(command, args.runs)
+        median = statistics.median(timings)
+        print(f"{label:45s} best {min(timings):7.1f} ms   median {median:7.1f} ms")
+        median_cli = median
+
+    if args.max_ms is not None and median_cli > args.max_ms:
+        print(f"FAIL: median CLI startup {median_cli:.1f} ms exceeds {args.max_ms:.1f} ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Benchmark DoorDash submission against the local mock endpoint.
+
+Submits synthetic orders with several in-flight limits and reports
+orders/sec and retries, with injected latency, 429s and 503s. Checks that
+every order is accepted, that orders rejected individually are recorded as
+failed, and that a rerun skips everything that already succeeded.
+
+Usage:
+    python benchmarks/bench_submit.py [--orders 20000] [--latency 0.01] [--rate-limit 0.05] [--errors 0.05]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from mock_doordash import start_mock_server  # noqa: E402
+from workwave_to_doordash import DoorDashSubmitter  # noqa: E402
+
+
+def make_orders(count):
+    """Return count DoorDash row dictionaries with distinct Order IDs."""
+    return [{'Pickup Location ID*': 'ANGEL-1', 'Order ID*': f"WW-{index:08d}", 'Date of Delivery*': '2025-09-02',
+             'Client First Name*': 'Maria', 'Client Last Name*': 'G', 'Client Street Address*': f"{index} Main St",
+             'Client City*': 'Los Angeles', 'Client State*': 'CA', 'Client ZIP*': '90001',
+             'Number of Items*': '1'} for index in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DoorDash submission against a mock endpoint.")
+    parser.add_argument('--orders', type=int, default=20000, help="Number of orders (default: 20000)")
+    parser.add_argument('--batch-size', type=int, default=100, help="Orders per request (default: 100)")
+    parser.add_argument('--in-flight', type=int, nargs='+', default=[1, 4, 16],
+                        help="In-flight limits to compare (default: 1 4 16)")
+    parser.add_argument('--latency', type=float, default=0.01, help="Mock latency per request (default: 0.01)")
+    parser.add_argument('--rate-limit', type=float, default=0.05, help="Share of 429 responses (default: 0.05)")
+    parser.add_argument('--errors', type=float, default=0.05, help="Share of 503 responses (default: 0.05)")
+    parser.add_argument('--reject', type=float, default=0.001, help="Share of orders rejected (default: 0.001)")
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders)
+    failures = 0
+    print(f"{'in-flight':>9} {'orders/sec':>11} {'retries':>8} {'failed':>7} {'rerun skipped':>14}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for in_flight in args.in_flight:
+            server = start_mock_server(latency=args.latency, rate_limit_ratio=args.rate_limit,
+                                       error_ratio=args.errors, reject_ratio=args.reject)
+            results_file = os.path.join(work_dir, f"results_{in_flight}.jsonl")
+            submitter = DoorDashSubmitter(server.url, results_file, batch_size=args.batch_size,
+                                          max_in_flight=in_flight, max_retries=10, backoff=0.01, max_backoff=0.2)
+            summary = submitter.submit(orders)
+            rejected = summary['failed']
+
+            # Without injected failures a rerun only resends the rejected orders
+            server.rate_limit_ratio = server.error_ratio = server.reject_ratio = 0.0
+            rerun = submitter.submit(orders)
+            server.shutdown()
+
+            duplicates = sum(1 for count in server.accepted.values() if count > 1)
+            ok = (len(server.accepted) == len(orders) and rerun['skipped'] == len(orders) - rejected
+                  and rerun['succeeded'] == rejected and duplicates == 0)
+            failures += not ok
+            print(f"{in_flight:>9} {summary['submitted'] / summary['duration']:>11,.0f} {summary['retries']:>8} "
+                  f"{rejected:>7} {rerun['skipped']:>14}{'' if ok else '  MISMATCH'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Check that every conversion path writes byte-identical output.
+
+Generates synthetic exports (see generate_workwave.py) with CRLF and LF line
+endings and a high share of messy, multi-line notes, converts each with the
+default serial engine, and compares the bytes written by the streaming, pandas
+and -j paths against it. -j is run with small chunks so records are split at
+many boundaries. A randomized stress test then splits the files with random
+chunk counts and quote-scan block sizes and converts the byte ranges in
+process, like the -j workers do.
+
+Usage:
+    python benchmarks/check_engines.py [--rows 20000] [--workers 2 3 8] [--trials 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import workwave_to_doordash  # noqa: E402
+from generate_workwave import generate_workwave_csv  # noqa: E402
+from workwave_to_doordash import WorkWaveToDoorDashConverter, convert_byte_range, split_records  # noqa: E402
+
+
+def read_bytes(path):
+    """Return the contents of a file as bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def make_inputs(work_dir, rows, seed):
+    """Write a CRLF and an LF export and return their paths."""
+    crlf_file = os.path.join(work_dir, "workwave_crlf.csv")
+    generate_workwave_csv(crlf_file, rows, messy_notes_ratio=0.5, malformed_address_ratio=0.1, seed=seed)
+    lf_file = os.path.join(work_dir, "workwave_lf.csv")
+    with open(lf_file, 'wb') as f:
+        f.write(read_bytes(crlf_file).replace(b'\r\n', b'\n'))
+    return [crlf_file, lf_file]
+
+
+def check_modes(converter, input_file, work_dir, workers):
+    """Convert input_file every way and return the number of outputs that differ from the serial one."""
+    reference_file = os.path.join(work_dir, "reference.csv")
+    start = time.perf_counter()
+    converter.convert_file(input_file, reference_file)
+    print(f"  {'serial':24s} {time.perf_counter() - start:7.2f}s  reference")
+    reference = read_bytes(reference_file)
+
+    modes = [("streaming", {'streaming': True}),
+             ("pandas", {'engine': 'pandas'}),
+             ("pandas streaming", {'engine': 'pandas', 'streaming': True})]
+    modes += [(f"-j {count}", {'workers': count}) for count in workers]
+    modes += [(f"-j {count} pandas", {'workers': count, 'engine': 'pandas'}) for count in workers]
+
+    mismatches = 0
+    output_file = os.path.join(work_dir, "output.csv")
+    for label, options in modes:
+        start = time.perf_counter()
+        converter.convert_file(input_file, output_file, **options)
+        seconds = time.perf_counter() - start
+        same = read_bytes(output_file) == reference
+        mismatches += not same
+        print(f"  {label:24s} {seconds:7.2f}s  {'identical' if same else 'MISMATCH'}")
+    return mismatches, reference
+
+
+def stress_chunks(converter, input_file, reference, work_dir, trials, rng):
+    """Convert random byte-range splits in process and return the number of trials that differ."""
+    import mmap
+    header, ranges = converter.read_workwave_chunks(input_file, 1)
+    data_start = ranges[0][0]
+    header_bytes = reference[:reference.index(b'\n') + 1]
+    part_file = os.path.join(work_dir, "part.csv")
+    failures = 0
+    for _ in range(trials):
+        workwave_to_doordash.QUOTE_SCAN_BLOCK_BYTES = rng.randint(1, 4096)
+        with open(input_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                ranges = split_records(mm, data_start, rng.randint(2, 64))
+        output = [header_bytes]
+        for range_start, range_end in ranges:
+            convert_byte_range(converter, input_file, header, range_start, range_end, part_file)
+            output.append(read_bytes(part_file))
+        if b''.join(output) != reference:
+            failures += 1
+            print(f"  MISMATCH with {len(ranges)} chunks: {ranges[:4]}...")
+    print(f"  random splits: {trials} trials, {failures} mismatches")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that all conversion paths write identical output.")
+    parser.add_argument('--rows', type=int, default=20000, help="Rows per synthetic export (default: 20000)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 3, 8],
+                        help="-j values to check (default: 2 3 8)")
+    parser.add_argument('--trials', type=int, default=200, help="Random chunk splits per export (default: 200)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    converter = WorkWaveToDoorDashConverter()
+    # Small chunks so -j splits even a small export at many record boundaries
+    workwave_to_doordash.MIN_PARALLEL_CHUNK_BYTES = 1
+    block_size = workwave_to_doordash.QUOTE_SCAN_BLOCK_BYTES
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as work_dir:
+        for input_file in make_inputs(work_dir, args.rows, args.seed):
+            print(os.path.basename(input_file))
+            mismatches, reference = check_modes(converter, input_file, work_dir, args.workers)
+            failures += mismatches
+            failures += stress_chunks(converter, input_file, reference, work_dir, args.trials, rng)
+            workwave_to_doordash.QUOTE_SCAN_BLOCK_BYTES = block_size
+    print("OK: all outputs identical" if not failures else f"FAIL: {failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Generate synthetic WorkWave Route Manager CSV exports for benchmarking.
+
+The files look like real exports: one departure row per route, stops with
+client names, addresses, phone numbers, time windows, notes and a block of
+'lb|' meal columns. A configurable share of the rows has messy notes
+(phrases the converter removes, stray whitespace, quotes, newlines, very long
+text) or malformed addresses that miss the "street, city, ST 12345" pattern.
+
+Usage:
+    python benchmarks/generate_workwave.py OUTPUT.csv --rows 100000 --meal-columns 40
+"""
+import argparse
+import csv
+import random
+import sys
+
+FIRST_NAMES = ["John", "Maria", "Wei", "Aisha", "Carlos", "Olga", "Samuel", "Priya", "Dmitri", "Grace",
+               "Luis", "Fatima", "Kenji", "Rosa", "Ahmed", "Elena"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Johnson", "Nguyen", "Kim", "Lopez", "Brown", "Okafor", "Patel",
+              "Ivanova", "Martinez", "de la Cruz", "O'Brien"]
+STREETS = ["Main St", "Elm Ave", "Sunset Blvd", "Figueroa St", "Vermont Ave", "Olympic Blvd", "Pico Blvd",
+           "Western Ave", "Hoover St", "Alvarado St"]
+CITIES = [("Los Angeles", "900"), ("Pasadena", "911"), ("Glendale", "912"), ("Burbank", "915"),
+          ("Long Beach", "908"), ("Inglewood", "903")]
+CLEAN_NOTES = ["", "", "", "Leave at front desk.", "Gate code 4321.", "Ring bell twice, dog in yard.",
+               "Use side entrance.", "Client is hard of hearing, knock loudly."]
+MESSY_NOTES = [
+    "Call CS for issues.",
+    "Please deliver after 3:30 PM. Gate code 1234.",
+    "  Leave   at door   please  ",
+    '"Ring bell" call cs for any issues',
+    "please deliver after 5",
+    "Building B, 2nd floor.\nUse side entrance.\nCall CS for issues.",
+    "Please deliver directly to the client. Do not leave unattended unless client has provided a cooler.",
+]
+MALFORMED_ADDRESSES = ["PO Box 4412", "123 Main St Los Angeles CA 90001", "55 Elm, Apt 4, Pasadena",
+                       "9 Oak Ave, Glendale, ca 91201", "77 Pine, Burbank, CA 9150", "Corner of 5th and Main"]
+MEAL_NAMES = ["Chicken", "Beef Stew", "Veggie Lasagna", "Lentil Soup", "Salmon", "Turkey Wrap", "Fruit Cup",
+              "Oatmeal", "Rice Bowl", "Tofu Stir Fry"]
+
+BASE_COLUMNS = ['Type', 'Route', 'Vehicle', 'Sequence', 'Name', 'Address', 'Apartment/CompanyName',
+                'ApartmentInfo', 'Date', 'Order Number', 'Notes', 'Phone Number', 'Time Window Start',
+                'Time Window End', 'Service Time']
+
+
+def meal_column_names(count):
+    """Return count distinct 'lb|' meal column names."""
+    return [f"lb|{MEAL_NAMES[index % len(MEAL_NAMES)]} {index // len(MEAL_NAMES) + 1}" for index in range(count)]
+
+
+def time_window(rng):
+    """Return a random (start, end) pair of "HH:MM AM/PM" strings."""
+    start = rng.randint(7, 16)
+    end = start + rng.randint(1, 3)
+    return (f"{(start - 1) % 12 + 1:02d}:{rng.choice(['00', '15', '30', '45'])} {'AM' if start < 12 else 'PM'}",
+            f"{(end - 1) % 12 + 1:02d}:00 {'AM' if end < 12 else 'PM'}")
+
+
+def generate_rows(rows, meal_columns=20, stops_per_route=40, messy_notes_ratio=0.2,
+                  malformed_address_ratio=0.05, dates=("09/02/2025", "09/03/2025"), seed=0):
+    """
+    Yield the header and then rows data rows of a synthetic WorkWave export.
+    Every route starts with a departure row, so about 1 in stops_per_route rows is a departure.
+    """
+    rng = random.Random(seed)
+    meals = meal_column_names(meal_columns)
+    yield BASE_COLUMNS + meals
+
+    route = 0
+    sequence = 0
+    for index in range(rows):
+        if sequence == 0:
+            route += 1
+            depot = rng.choice(CITIES)[0]
+            yield (['departure', f"R{route}", f"Vehicle {route % 25 + 1}", '0', '',
+                    f"1 Depot Way, {depot}, CA 90001", '', '', rng.choice(dates), '', '', '', '', '', '']
+                   + [''] * meal_columns)
+            sequence = 1
+            continue
+
+        city, zip_prefix = rng.choice(CITIES)
+        if rng.random() < malformed_address_ratio:
+            address = rng.choice(MALFORMED_ADDRESSES)
+        else:
+            address = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {city}, CA {zip_prefix}{rng.randint(0, 99):02d}"
+        notes = rng.choice(MESSY_NOTES) if rng.random() < messy_notes_ratio else rng.choice(CLEAN_NOTES)
+        if rng.random() < 0.01:
+            notes = "Long note. " * rng.randint(20, 40)
+        start, end = time_window(rng)
+
+        meal_values = [''] * meal_columns
+        for _ in range(rng.randint(1, 4) if meal_columns else 0):
+            meal_values[rng.randrange(meal_columns)] = rng.choice(['1', '1', '2', '3', 'x', ' 1 '])
+
+        yield ([rng.choice(['delivery', 'Delivery']), f"R{route}", f"Vehicle {route % 25 + 1}", str(sequence),
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", address,
+                rng.choice(['', '', '', f"Apt {rng.randint(1, 400)}"]), rng.choice(['', '', f"Unit {rng.randint(1, 40)}"]),
+                rng.choice(dates), f"WW-{index:08d}", notes,
+                f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}", start, end, '00:05']
+               + meal_values)
+        sequence = (sequence + 1) % stops_per_route
+
+
+def generate_workwave_csv(file_path, rows, **options):
+    """Write a synthetic WorkWave export with rows data rows to file_path."""
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(generate_rows(rows, **options))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic WorkWave CSV export.")
+    parser.add_argument('output', help="CSV file to write")
+    parser.add_argument('--rows', type=int, default=1000, help="Number of data rows (default: 1000)")
+    parser.add_argument('--meal-columns', type=int, default=20, help="Number of 'lb|' columns (default: 20)")
+    parser.add_argument('--stops-per-route', type=int, default=40,
+                        help="Rows per route, including its departure row (default: 40)")
+    parser.add_argument('--messy-notes', type=float, default=0.2, help="Share of rows with messy notes (default: 0.2)")
+    parser.add_argument('--malformed-addresses', type=float, default=0.05,
+                        help="Share of rows with malformed addresses (default: 0.05)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    generate_workwave_csv(args.output, args.rows, meal_columns=args.meal_columns,
+                          stops_per_route=args.stops_per_route, messy_notes_ratio=args.messy_notes,
+                          malformed_address_ratio=args.malformed_addresses, seed=args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
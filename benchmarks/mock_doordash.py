@@ -0,0 +1,123 @@
+"""
+Local mock of a DoorDash-style bulk order endpoint for offline testing.
+
+Accepts POST requests with {"orders": [...]} over keep-alive HTTP/1.1
+connections and answers {"results": [{"order_id": ..., "status": "accepted"}]}.
+Latency, rate limiting (429 with Retry-After), server errors (503) and
+per-order rejections can be injected at configurable rates. Every accepted
+order is counted, so duplicates caused by retries can be detected.
+
+Usage:
+    python benchmarks/mock_doordash.py --port 8099 --rate-limit 0.05 --errors 0.05 --latency 0.02
+    python -m workwave_to_doordash submit routes_doordash.csv --endpoint http://127.0.0.1:8099/orders
+"""
+import argparse
+import collections
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockDoorDashHandler(BaseHTTPRequestHandler):
+    """Handle one request to the mock endpoint."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with server.lock:
+            server.requests += 1
+            roll = server.random.random()
+        if server.latency:
+            time.sleep(server.latency)
+
+        if roll < server.rate_limit_ratio:
+            with server.lock:
+                server.rate_limited += 1
+            self.respond(429, {'error': 'rate limited'}, {'Retry-After': str(server.retry_after)})
+            return
+        if roll < server.rate_limit_ratio + server.error_ratio:
+            with server.lock:
+                server.errors += 1
+            self.respond(503, {'error': 'unavailable'})
+            return
+
+        try:
+            orders = json.loads(body)['orders']
+        except (ValueError, KeyError, TypeError):
+            self.respond(400, {'error': 'expected {"orders": [...]}'})
+            return
+
+        results = []
+        with server.lock:
+            for order in orders:
+                order_id = order.get('Order ID*', '')
+                if server.random.random() < server.reject_ratio:
+                    results.append({'order_id': order_id, 'error': 'invalid address'})
+                else:
+                    server.accepted[order_id] += 1
+                    results.append({'order_id': order_id, 'status': 'accepted'})
+        self.respond(200, {'results': results})
+
+    def respond(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(port=0, latency=0.0, rate_limit_ratio=0.0, error_ratio=0.0, reject_ratio=0.0,
+                      retry_after=0, seed=0):
+    """
+    Start the mock endpoint on 127.0.0.1 in a background thread and return the server.
+    Its url attribute is the endpoint; accepted counts accepted orders by Order ID.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockDoorDashHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.random = random.Random(seed)
+    server.latency = latency
+    server.rate_limit_ratio = rate_limit_ratio
+    server.error_ratio = error_ratio
+    server.reject_ratio = reject_ratio
+    server.retry_after = retry_after
+    server.requests = server.rate_limited = server.errors = 0
+    server.accepted = collections.Counter()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/orders"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock DoorDash bulk order endpoint.")
+    parser.add_argument('--port', type=int, default=8099, help="Port to listen on (default: 8099)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument('--rate-limit', type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument('--errors', type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument('--reject', type=float, default=0.0, help="Share of orders rejected individually")
+    parser.add_argument('--retry-after', type=int, default=0, help="Retry-After seconds sent with 429")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.port, args.latency, args.rate_limit, args.errors, args.reject, args.retry_after)
+    print(f"Mock DoorDash endpoint at {server.url}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"{server.requests} requests, {sum(server.accepted.values())} orders accepted "
+              f"({len(server.accepted)} distinct), {server.rate_limited} rate limited, {server.errors} errors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Benchmark the read, convert and write stages on synthetic WorkWave exports.
+
+For each size a synthetic export is generated (see generate_workwave.py) and
+each stage is timed separately, reporting rows/sec. Peak memory of each stage
+is measured in a second, traced run with tracemalloc so tracing does not
+skew the timings. Results are saved as JSON and can be compared against an
+earlier run.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --sizes 100 10000 --baseline results.json --max-regression 10
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from generate_workwave import generate_workwave_csv  # noqa: E402
+from workwave_to_doordash import WorkWaveToDoorDashConverter  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000, 1000000]
+STAGES = ('read', 'convert', 'write')
+
+
+def run_stages(converter, input_file, output_file, engine, trace_memory):
+    """
+    Run read, convert and write once, returning {stage: (seconds, peak_bytes)}.
+    peak_bytes is None unless trace_memory is set.
+    """
+    results = {}
+    state = {}
+
+    def read():
+        plan, records = converter.open_workwave_records(input_file)
+        state['plan'] = plan
+        state['records'] = list(records)
+
+    def convert():
+        if engine == 'pandas':
+            rows = converter.iter_convert_records_pandas(state['plan'], state['records'])
+        else:
+            rows = converter.iter_convert_records(state['plan'], state['records'])
+        state['rows'] = list(rows)
+
+    def write():
+        converter.write_doordash_csv(state['rows'], output_file)
+
+    for stage, function in zip(STAGES, (read, convert, write)):
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[stage] = (seconds, peak)
+    return results
+
+
+def benchmark_size(rows, meal_columns, engine, repeat, measure_memory, work_dir):
+    """Benchmark one input size and return a result entry per stage."""
+    input_file = os.path.join(work_dir, f"workwave_{rows}.csv")
+    output_file = os.path.join(work_dir, f"doordash_{rows}.csv")
+    generate_workwave_csv(input_file, rows, meal_columns=meal_columns)
+    converter = WorkWaveToDoorDashConverter()
+
+    best = {stage: None for stage in STAGES}
+    for _ in range(repeat):
+        for stage, (seconds, _) in run_stages(converter, input_file, output_file, engine, False).items():
+            if best[stage] is None or seconds < best[stage]:
+                best[stage] = seconds
+
+    peaks = {stage: None for stage in STAGES}
+    if measure_memory:
+        for stage, (_, peak) in run_stages(converter, input_file, output_file, engine, True).items():
+            peaks[stage] = peak
+
+    os.remove(input_file)
+    os.remove(output_file)
+    return [{
+        'rows': rows,
+        'stage': stage,
+        'seconds': best[stage],
+        'rows_per_sec': rows / best[stage] if best[stage] else None,
+        'peak_bytes': peaks[stage],
+    } for stage in STAGES]
+
+
+def compare(results, baseline, max_regression):
+    """Print the change against a baseline run; return True if any stage regressed too much."""
+    previous = {(entry['rows'], entry['stage']): entry for entry in baseline['results']}
+    regressed = False
+    print()
+    print(f"{'rows':>9} {'stage':8} {'rows/sec':>12} {'change':>8} {'peak MiB':>9} {'change':>8}")
+    for entry in results:
+        old = previous.get((entry['rows'], entry['stage']))
+        if old is None:
+            continue
+        speed_change = 100.0 * (entry['rows_per_sec'] / old['rows_per_sec'] - 1)
+        memory_change = ''
+        if entry['peak_bytes'] and old.get('peak_bytes'):
+            memory_change = f"{100.0 * (entry['peak_bytes'] / old['peak_bytes'] - 1):+7.1f}%"
+        peak = f"{entry['peak_bytes'] / 2 ** 20:9.1f}" if entry['peak_bytes'] else f"{'-':>9}"
+        print(f"{entry['rows']:>9} {entry['stage']:8} {entry['rows_per_sec']:>12,.0f} {speed_change:+7.1f}% "
+              f"{peak} {memory_change:>8}")
+        if max_regression is not None and speed_change < -max_regression:
+            regressed = True
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WorkWave to DoorDash conversion stages.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Numbers of rows to benchmark (default: 100 to 1000000)")
+    parser.add_argument('--meal-columns', type=int, default=20, help="Number of 'lb|' columns (default: 20)")
+    parser.add_argument('--engine', choices=('python', 'pandas'), default='python', help="Conversion engine")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing runs per size; the best is kept (default: 3)")
+    parser.add_argument('--no-memory', dest='measure_memory', action='store_false',
+                        help="Skip the traced run that measures peak memory")
+    parser.add_argument('--output', help="Save results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against results saved by an earlier run")
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help="Exit with status 1 if any stage is this many percent slower than the baseline")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Runs with a different engine or export shape are not comparable
+        for key, value in (('engine', args.engine), ('meal_columns', args.meal_columns)):
+            if baseline['meta'].get(key) != value:
+                print(f"Error: baseline {args.baseline} was run with {key}={baseline['meta'].get(key)!r}, "
+                      f"this run uses {key}={value!r}", file=sys.stderr)
+                return 2
+
+    results = []
+    print(f"{'rows':>9} {'stage':8} {'seconds':>9} {'rows/sec':>12} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Warm up imports and caches so the first size is not penalized
+        benchmark_size(100, args.meal_columns, args.engine, 1, False, work_dir)
+        for rows in args.sizes:
+            for entry in benchmark_size(rows, args.meal_columns, args.engine, args.repeat,
+                                        args.measure_memory, work_dir):
+                results.append(entry)
+                peak = f"{entry['peak_bytes'] / 2 ** 20:9.1f}" if entry['peak_bytes'] is not None else f"{'-':>9}"
+                print(f"{entry['rows']:>9} {entry['stage']:8} {entry['seconds']:9.3f} "
+                      f"{entry['rows_per_sec']:>12,.0f} {peak}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': args.engine,
+            'meal_columns': args.meal_columns,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+    if baseline is not None:
+        if compare(results, baseline, args.max_regression):
+            print("FAIL: throughput regressed beyond --max-regression")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,170 @@
+import argparse
+import calendar
+import codecs
+import collections
+import copy
 import csv
+import fnmatch
+import functools
+import glob
+import hashlib
+import io
+import itertools
+import json
+import mmap
+import operator
 import re
 import os
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+import queue
+import random
+import select
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
 from datetime import datetime
-import pandas as pd
+
+# tkinter, pandas and pyarrow are imported on first use so the command line starts fast and runs headless
+tk = filedialog = messagebox = ttk = None
+pd = None
+pa = pq = None
+
+
+def load_tkinter():
+    """Import tkinter for the GUI."""
+    global tk, filedialog, messagebox, ttk
+    if tk is None:
+        import tkinter
+        from tkinter import filedialog, messagebox, ttk
+        tk = tkinter
+
+
+def load_pandas():
+    """Import pandas for the pandas engine."""
+    global pd
+    if pd is None:
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("The pandas engine requires pandas. Install it with: pip install pandas")
+        pd = pandas
+
+
+def load_pyarrow():
+    """Import pyarrow for Parquet output."""
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+# Pattern for "street, city, state zip" addresses
+ADDRESS_PATTERN = r"(.*?),\s*(.*?),\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)"
+ADDRESS_REGEX = re.compile(ADDRESS_PATTERN)
+
+# Default rules for phrases removed from delivery notes (case-insensitive regular expressions)
+DEFAULT_DROPOFF_REMOVAL_RULES = [
+    r"Call CS for (any )?issues\.?",
+    r"Please deliver after \d+(\:\d+)?( [AP]M)?\.?",
+]
+
+# Standard instruction added to every dropoff note
+STANDARD_NOTE = "Please deliver directly to the client. Do not leave unattended unless client has provided a cooler."
+STANDARD_NOTE_LOWER = STANDARD_NOTE.lower()
+
+# Conversion engines and the number of rows per pandas chunk when streaming
+ENGINES = ('python', 'pandas')
+PANDAS_CHUNK_SIZE = 50000
+
+# Files are only split for parallel conversion into chunks of at least this size; larger files are
+# split into chunks of at most MAX_PARALLEL_CHUNK_BYTES handed out to the pool, so worker memory stays bounded
+MIN_PARALLEL_CHUNK_BYTES = 1024 * 1024
+MAX_PARALLEL_CHUNK_BYTES = 4 * 1024 * 1024
+QUOTE_SCAN_BLOCK_BYTES = 1024 * 1024
+
+# Compressed WorkWave exports are recognized by their first bytes and read without unpacking them to disk
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_MAGIC = b'PK\x03\x04'
+COMPRESSED_SUFFIXES = ('.gz', '.zip')
+
+# gzip is read and written through a large buffer; level 6 compresses nearly as well as 9 in less time
+GZIP_BUFFER_BYTES = 1024 * 1024
+GZIP_COMPRESS_LEVEL = 6
+
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 65536
+
+# Progress is reported and cancellation checked every this many rows
+PROGRESS_INTERVAL = 1000
+
+# Per-row helpers timed by Instrumentation, and the names they are reported under
+INSTRUMENTED_HELPERS = {
+    'parse_address': 'parse_address',
+    'parse_name': 'parse_name',
+    'format_date': 'format_date',
+    'process_dropoff_instructions': 'process_dropoff_instructions',
+    'count_meal_values': 'count_meal_items',
+}
+
+# Number of distinct date and time strings memoized by format_date_value/format_time_value
+DATE_TIME_MEMO_SIZE = 4096
+
+# Parse cache format version and default number of entries kept per kind
+CACHE_VERSION = 1
+DEFAULT_CACHE_ENTRIES = 50000
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.workwave_to_doordash_cache.sqlite3')
+
+# Formats required (*) DoorDash fields must have to pass validation; phone numbers need 10 digits
+VALIDATION_FORMATS = {
+    'date_of_delivery': re.compile(r'\d{4}-\d{2}-\d{2}\Z'),
+    'state': re.compile(r'[A-Z]{2}\Z'),
+    'zip_code': re.compile(r'\d{5}(?:-\d{4})?\Z'),
+    'phone': re.compile(r'(?:\D*\d){10}'),
+}
+
+# Incremental conversion manifest format version
+MANIFEST_VERSION = 1
+
+# How merge resolves an order that has different contents in several exports
+MERGE_POLICIES = ('last', 'window', 'flag')
+TIME_KEY = re.compile(r'(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d\Z')
+
+# Partitioned output: keys rows can be split by, and how many output files are kept open at once
+PARTITION_KEYS = ('date', 'location')
+DEFAULT_MAX_OPEN_FILES = 64
+
+# Watch folder: seconds a new file must stay unchanged before it is converted, seconds between
+# checks when idle, attempts at a file whose worker process dies, and the ledger of processed files
+WATCH_SETTLE_SECONDS = 1.0
+WATCH_POLL_INTERVAL = 1.0
+WATCH_MAX_ATTEMPTS = 3
+WATCH_LEDGER_NAME = '.workwave_watch_ledger.jsonl'
+
+# Conversion service defaults and the size of each read from an upload
+DEFAULT_SERVICE_PORT = 8080
+DEFAULT_SERVICE_CONCURRENCY = 4
+SERVICE_READ_SIZE = 65536
+SERVICE_LINGER_SECONDS = 2.0
+
+# DoorDash submission defaults: orders per request, requests in flight, retries and backoff in seconds
+SUBMIT_BATCH_SIZE = 100
+SUBMIT_MAX_IN_FLIGHT = 4
+SUBMIT_MAX_RETRIES = 5
+SUBMIT_BACKOFF_SECONDS = 0.5
+SUBMIT_MAX_BACKOFF_SECONDS = 30.0
+SUBMIT_TIMEOUT_SECONDS = 30.0
+
+# inotify events that mean a file in the watched directory was created, written or moved in
+INOTIFY_MASK = 0x2 | 0x8 | 0x80 | 0x100  # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# How often the GUI polls the conversion thread for progress events
+GUI_POLL_INTERVAL_MS = 100
 
 class WorkWaveToDoorDashConverter:
     """
@@ -23,6 +183,22 @@ class WorkWaveToDoorDashConverter:
         self.timezone = "US/Pacific"
         self.default_dropoff_instructions = "Please call upon arrival and hand meals to client. Please deliver directly to the client. Do not leave unattended unless client has provided a cooler."
         
+        # Optional persistent cache of parsed addresses, names and notes (see ParseCache)
+        self.cache = None
+        
+        # Optional timings and counters for each conversion (see Instrumentation)
+        self.instrumentation = None
+        
+        # Optional WorkWave column (e.g. 'Vehicle') giving each row's pickup location, and a map of its
+        # values to pickup location IDs; used by convert_file_partitioned
+        self.pickup_location_column = None
+        self.pickup_location_map = {}
+        
+        # Phrases removed from delivery notes, compiled into one regex on first use
+        self.dropoff_removal_rules = list(DEFAULT_DROPOFF_REMOVAL_RULES)
+        self._compiled_rules_source = None
+        self._compiled_rules = None
+        
         # Field mappings
         self.workwave_fields = {
             'address': 'Address',
@@ -47,6 +223,44 @@ class WorkWaveToDoorDashConverter:
             'Pickup Location Name', 'Pickup Phone Number', 'Pickup Instructions', 'Order Volume'
         ]
     
+    def __getstate__(self):
+        """Leave the cache and instrumentation behind when the converter is sent to a worker process."""
+        state = self.__dict__.copy()
+        state['cache'] = None
+        state['instrumentation'] = None
+        for name in INSTRUMENTED_HELPERS:
+            state.pop(name, None)
+        return state
+    
+    def install_instrumentation(self):
+        """
+        Shadow the per-row helpers with timed wrappers for the current conversion.
+        Without instrumentation the plain methods are called, so there is no overhead.
+        """
+        instrumentation = self.instrumentation
+        for name, label in INSTRUMENTED_HELPERS.items():
+            function = getattr(type(self), name).__get__(self)
+            if name == 'format_date':
+                function = instrumentation.count_unchanged(f"{label}.invalid", function)
+            setattr(self, name, instrumentation.timed(label, function))
+    
+    def remove_instrumentation(self):
+        """Remove the timed wrappers installed by install_instrumentation."""
+        for name in INSTRUMENTED_HELPERS:
+            self.__dict__.pop(name, None)
+    
+    def cache_fingerprints(self):
+        """
+        Return a fingerprint per cache kind of everything its cached results depend on,
+        so cached results are dropped when the code or the relevant settings change.
+        """
+        return {
+            'address': f"{CACHE_VERSION}|{ADDRESS_PATTERN}",
+            'name': f"{CACHE_VERSION}",
+            'notes': json.dumps([CACHE_VERSION, self.default_dropoff_instructions,
+                                 list(self.dropoff_removal_rules), STANDARD_NOTE]),
+        }
+    
     def parse_address(self, address):
         """
         Parse a WorkWave address into components: street address, city, state, zip.
@@ -60,8 +274,7 @@ class WorkWaveToDoorDashConverter:
         address = address.strip('"')
         
         # Try to match the pattern: street, city, state zip
-        pattern = r"(.*?),\s*(.*?),\s*([A-Z]{2})\s*(\d{5}(?:-\d{4})?)"
-        match = re.search(pattern, address)
+        match = ADDRESS_REGEX.search(address)
         
         if match:
             street = match.group(1).strip()
@@ -70,6 +283,9 @@ class WorkWaveToDoorDashConverter:
             zip_code = match.group(4).strip()
             return street, city, state, zip_code
         
+        if self.instrumentation is not None:
+            self.instrumentation.count('parse_address.regex_miss')
+        
         # If the pattern doesn't match, try a simpler approach
         parts = address.split(',')
         if len(parts) >= 3:
@@ -82,6 +298,8 @@ class WorkWaveToDoorDashConverter:
                 return street, city, state, zip_code
         
         # If all else fails, return the original address as street and empty for others
+        if self.instrumentation is not None:
+            self.instrumentation.count('parse_address.unparsed')
         return address, "", "", ""
     
     def parse_name(self, name):
@@ -103,211 +321,2730 @@ class WorkWaveToDoorDashConverter:
         else:
             return "", ""
     
-    def format_date(self, date_str):
-        """
-        Convert date from MM/DD/YYYY to YYYY-MM-DD.
-        Example: "09/02/2025" -> "2025-09-02"
-        """
-        if not date_str or date_str.strip() == "":
-            return ""
-            
+    def format_date(self, date_str):
+        """
+        Convert date from MM/DD/YYYY to YYYY-MM-DD.
+        Example: "09/02/2025" -> "2025-09-02"
+        """
+        return format_date_value(date_str)
+    
+    def format_time(self, time_str):
+        """
+        Convert time from "HH:MM AM/PM" to 24-hour format "HH:MM:SS".
+        Example: "07:15 AM" -> "07:15:00"
+        """
+        return format_time_value(time_str)
+    
+    def compiled_dropoff_rules(self):
+        """
+        Return the dropoff removal rules compiled into a single case-insensitive regex,
+        or None if there are no rules. Recompiled only when the rule list changes.
+        """
+        if self._compiled_rules_source != self.dropoff_removal_rules:
+            rules = list(self.dropoff_removal_rules)
+            if rules:
+                self._compiled_rules = re.compile('|'.join(f"(?:{rule})" for rule in rules), re.IGNORECASE)
+            else:
+                self._compiled_rules = None
+            self._compiled_rules_source = rules
+        return self._compiled_rules
+    
+    def process_dropoff_instructions(self, notes):
+        """
+        Process delivery notes to create appropriate dropoff instructions.
+        - Remove phrases matching dropoff_removal_rules (by default "Call CS for issues"
+          and "Please deliver after X time") in a single regex pass
+        - Add standard delivery instruction to every note
+        - If blank, use default instructions
+        """
+        if not notes or notes.strip() == "":
+            return self.default_dropoff_instructions
+            
+        # Remove quotes if present
+        notes = notes.strip('"')
+        
+        # Remove specific phrases
+        rules = self.compiled_dropoff_rules()
+        if rules is not None:
+            notes = rules.sub("", notes)
+        
+        # Clean up any double spaces or leading/trailing spaces
+        notes = " ".join(notes.split())
+        
+        # If notes are now empty, use default
+        if not notes:
+            notes = self.default_dropoff_instructions
+            
+        # Check if the standard note is already included in the instructions;
+        # an exact match avoids lowercasing the whole note
+        if STANDARD_NOTE not in notes and STANDARD_NOTE_LOWER not in notes.lower():
+            # Combine notes with standard instruction
+            combined_notes = f"{notes} {STANDARD_NOTE}"
+            
+            # Ensure notes don't exceed 250 characters
+            if len(combined_notes) > 250:
+                if self.instrumentation is not None:
+                    self.instrumentation.count('process_dropoff_instructions.truncated')
+                
+                # If too long, prioritize the standard note and truncate the original notes
+                max_original_length = 250 - len(STANDARD_NOTE) - 4  # 4 chars for " ..."
+                notes = f"{notes[:max_original_length]}... {STANDARD_NOTE}"
+            else:
+                notes = combined_notes
+        
+        return notes
+    
+    def meal_item_value(self, value):
+        """
+        Return the number of meal items a single 'lb|' value contributes.
+        Numeric values count as themselves, any other non-empty value counts as 1.
+        """
+        if not value or not value.strip():
+            return 0
+        try:
+            # Try to convert the value to an integer
+            return int(value.strip())
+        except ValueError:
+            # If the value is not a number but not empty, count it as 1
+            if self.instrumentation is not None:
+                self.instrumentation.count('count_meal_items.non_numeric')
+            return 1
+    
+    def count_meal_values(self, values):
+        """
+        Count the number of meal items from the values of the 'lb|' columns.
+        """
+        meal_count = 0
+        for value in values:
+            meal_count += self.meal_item_value(value)
+        
+        # If no meals were found, default to 1 as mentioned in the transcript
+        return max(1, meal_count)
+    
+    def count_meal_items(self, row):
+        """
+        Count the number of meal items for a client.
+        Meal items in WorkWave start with 'lb|'.
+        """
+        return self.count_meal_values(value for key, value in row.items() if key.startswith('lb|'))
+    
+    def build_doordash_row(self, address, name, unit, date_str, notes, phone, order_id, num_items):
+        """
+        Build a DoorDash row from the raw WorkWave values of a single stop.
+        """
+        cache = self.cache
+        if cache is None:
+            # Parse address
+            street, city, state, zip_code = self.parse_address(address)
+            
+            # Parse name
+            first_name, last_initial = self.parse_name(name)
+            
+            # Process notes/instructions
+            dropoff_instructions = self.process_dropoff_instructions(notes)
+        else:
+            # Same steps, reusing results stored by earlier runs
+            street, city, state, zip_code = cache.get('address', address, self.parse_address)
+            first_name, last_initial = cache.get('name', name, self.parse_name)
+            dropoff_instructions = cache.get('notes', notes, self.process_dropoff_instructions)
+        
+        # Format date
+        formatted_date = self.format_date(date_str)
+        
+        # Create DoorDash record; constant columns are added when it is written
+        return DoorDashRecord._make((order_id, formatted_date, first_name, last_initial, street, unit, city, state,
+                                     zip_code, phone, num_items, dropoff_instructions))
+    
+    def constant_columns(self):
+        """
+        Return the DoorDash columns that are the same for every row, from the current settings.
+        """
+        return {
+            'Pickup Location ID*': self.pickup_location_id,
+            'Pickup Window Start*': self.pickup_window_start,
+            'Pickup Window End*': self.pickup_window_end,
+            'Timezone*': self.timezone,
+            'Pickup Location Name': self.pickup_location_name,
+            'Pickup Phone Number': self.pickup_phone_number,
+            'Pickup Instructions': self.pickup_instructions,
+            'Order Volume': ''
+        }
+    
+    def row_layout(self, pickup_location_id=None):
+        """
+        Return a function that turns a DoorDashRecord into a tuple of values in doordash_fields order,
+        merging in the constant columns. Built once per file so each row costs one tuple concatenation
+        and one itemgetter call. pickup_location_id overrides the configured pickup location.
+        """
+        constants = self.constant_columns()
+        if pickup_location_id is not None:
+            constants['Pickup Location ID*'] = pickup_location_id
+        constant_values = tuple(constants.get(field, '') for field in self.doordash_fields)
+        record_size = len(DoorDashRecord._fields)
+        positions = []
+        for index, field in enumerate(self.doordash_fields):
+            if field in RECORD_COLUMNS:
+                positions.append(DoorDashRecord._fields.index(RECORD_COLUMNS[field]))
+            else:
+                positions.append(record_size + index)
+        getter = operator.itemgetter(*positions)
+        if len(positions) == 1:
+            return lambda record: (getter(record + constant_values),)
+        return lambda record: getter(record + constant_values)
+    
+    def record_to_dict(self, record, layout=None):
+        """
+        Return a DoorDashRecord as a full DoorDash row dictionary.
+        Pass a layout from row_layout() when converting many records to build it only once.
+        """
+        layout = layout or self.row_layout()
+        return dict(zip(self.doordash_fields, layout(record)))
+    
+    def convert_row(self, row, layout=None):
+        """
+        Convert a single WorkWave row (a dictionary) to a DoorDash row.
+        Returns None for header, empty and departure rows. layout is passed to record_to_dict.
+        """
+        # Skip header row or empty rows
+        if row.get(self.workwave_fields['address']) == 'Address' or not row.get(self.workwave_fields['address']):
+            return None
+            
+        # Skip departure rows
+        if row.get('Type', '').lower() == 'departure':
+            return None
+        
+        return self.record_to_dict(self.build_doordash_row(
+            row.get(self.workwave_fields['address'], ''),
+            row.get(self.workwave_fields['name'], ''),
+            row.get(self.workwave_fields['unit'], '') or row.get(self.workwave_fields['unit_info'], ''),
+            row.get(self.workwave_fields['date'], ''),
+            row.get(self.workwave_fields['notes'], ''),
+            row.get(self.workwave_fields['phone'], ''),
+            row.get(self.workwave_fields['order_number'], ''),
+            str(self.count_meal_items(row))
+        ), layout)
+    
+    def iter_convert_workwave_to_doordash(self, workwave_data):
+        """
+        Lazily convert WorkWave rows to DoorDash rows.
+        Accepts any iterable of rows and yields each DoorDash row as soon as it is converted.
+        """
+        layout = self.row_layout()
+        for row in workwave_data:
+            doordash_row = self.convert_row(row, layout)
+            if doordash_row is not None:
+                yield doordash_row
+    
+    def convert_workwave_to_doordash(self, workwave_data, engine='python'):
+        """
+        Convert WorkWave data to DoorDash format.
+        engine='pandas' converts the rows column by column instead of row by row.
+        """
+        if engine == 'pandas':
+            workwave_data = list(workwave_data)
+            header = [key for key in (workwave_data[0] if workwave_data else {}) if isinstance(key, str)]
+            plan = self.build_conversion_plan(header)
+            records = [[row.get(key) for key in header] for row in workwave_data]
+            layout = self.row_layout()
+            return [self.record_to_dict(record, layout)
+                    for record in self.convert_dataframe(plan, self.records_to_dataframe(plan, records))]
+        if engine != 'python':
+            raise ValueError(f"Unknown conversion engine: {engine}")
+        return list(self.iter_convert_workwave_to_doordash(workwave_data))
+    
+    def build_conversion_plan(self, header):
+        """
+        Build a conversion plan for a WorkWave CSV header.
+        """
+        return ConversionPlan(header, self.workwave_fields)
+    
+    def convert_record(self, plan, record):
+        """
+        Convert a single positional WorkWave record using a conversion plan.
+        Returns None for header, empty and departure rows.
+        """
+        record = plan.stop(record)
+        if record is None:
+            return None
+        
+        return self.build_doordash_row(
+            record[plan.address],
+            plan.value(record, plan.name),
+            plan.value(record, plan.unit) or plan.value(record, plan.unit_info),
+            plan.value(record, plan.date),
+            plan.value(record, plan.notes),
+            plan.value(record, plan.phone),
+            plan.value(record, plan.order_number),
+            str(self.count_meal_values([record[i] for i in plan.meals]))
+        )
+    
+    def iter_convert_records(self, plan, records):
+        """
+        Lazily convert positional WorkWave records to DoorDash rows using a conversion plan.
+        """
+        convert_record = self.convert_record
+        for record in records:
+            doordash_row = convert_record(plan, record)
+            if doordash_row is not None:
+                yield doordash_row
+    
+    def record_validator(self):
+        """
+        Return a function that checks a DoorDashRecord against the required (*) DoorDash fields
+        and returns a list of reason codes, empty if the row can be imported. Rows pass a fast
+        check first; reasons are only worked out for rows that fail it. The constant columns
+        are checked once, here.
+        """
+        constants = self.constant_columns()
+        constant_reasons = [f"missing_{reason_code(field)}" for field in self.doordash_fields
+                            if field.endswith('*') and field not in RECORD_COLUMNS
+                            and not str(constants.get(field, '')).strip()]
+        required = [(DoorDashRecord._fields.index(RECORD_COLUMNS[field]), RECORD_COLUMNS[field], reason_code(field))
+                    for field in self.doordash_fields if field.endswith('*') and field in RECORD_COLUMNS]
+        formats = [(index, VALIDATION_FORMATS[name].match) for index, name, code in required
+                   if name in VALIDATION_FORMATS]
+        getter = operator.itemgetter(*[index for index, name, code in required]) if required else None
+        values_of = getter if len(required) > 1 else lambda record: (getter(record),) if getter else ()
+        
+        def validate(record):
+            if all(map(str.strip, values_of(record))):
+                for index, match in formats:
+                    if not match(record[index]):
+                        break
+                else:
+                    return constant_reasons
+            return validation_reasons(record, required) + constant_reasons
+        return validate
+    
+    def iter_convert_validated(self, plan, records, reject):
+        """
+        Convert (line, record) pairs like iter_convert_records, validating every converted row.
+        Rows that fail are passed to reject(line, record, reasons) instead of being yielded.
+        """
+        convert_record = self.convert_record
+        validate = self.record_validator()
+        for line, record in records:
+            doordash_row = convert_record(plan, record)
+            if doordash_row is None:
+                continue
+            reasons = validate(doordash_row)
+            if reasons:
+                reject(line, record, reasons)
+            else:
+                yield doordash_row
+    
+    def records_to_dataframe(self, plan, records):
+        """
+        Build a DataFrame of WorkWave records with one string column per header position.
+        Short rows are padded with '' and extra trailing fields are dropped. The records are
+        copied into a single object array, which is much faster than DataFrame.from_records.
+        """
+        load_pandas()
+        import numpy as np
+        width = plan.width
+        records = [record if len(record) == width else (list(record) + [''] * width)[:width] for record in records]
+        values = np.array(records, dtype=object) if records else np.empty((0, width), dtype=object)
+        return pd.DataFrame(values.reshape(len(records), width), columns=range(width), dtype=object, copy=False)
+    
+    def convert_dataframe(self, plan, df):
+        """
+        Convert a DataFrame of positional WorkWave records to DoorDash rows.
+        Each column is factorized and the row helpers run once per distinct value, so repeated
+        clients, addresses, dates and meal values cost a hash lookup per row. The output is
+        identical to the row-by-row path. Returns a list of DoorDashRecord.
+        """
+        load_pandas()
+        import numpy as np
+        
+        def column(position):
+            if position is None:
+                return np.full(len(df), '', dtype=object)
+            return df[position].to_numpy(dtype=object)
+        
+        def map_distinct(values, function):
+            # One call per distinct value; tuple results come back as one column per element
+            codes, uniques = pd.factorize(values)
+            return np.array([function(value) for value in uniques] or [''], dtype=object)[codes]
+        
+        # Skip header rows, empty rows and departure rows
+        address = column(plan.address)
+        keep = (address != '') & (address != 'Address')
+        if plan.type is not None:
+            keep &= map_distinct(column(plan.type), lambda value: value.lower() != 'departure').astype(bool)
+        df = df[keep]
+        
+        if df.empty:
+            return []
+        
+        address = map_distinct(column(plan.address), self.parse_address)
+        name = map_distinct(column(plan.name), self.parse_name)
+        unit = column(plan.unit)
+        unit = np.where(unit != '', unit, column(plan.unit_info))
+        formatted_date = map_distinct(column(plan.date), self.format_date)
+        dropoff_instructions = map_distinct(column(plan.notes), self.process_dropoff_instructions)
+        
+        # Sum meal columns with one lookup over all of their values
+        if plan.meals:
+            meals = df[plan.meals].to_numpy(dtype=object)
+            codes, uniques = pd.factorize(meals.ravel())
+            values = np.array([self.meal_item_value(value) for value in uniques])
+            meal_count = np.maximum(values[codes].reshape(meals.shape).sum(axis=1), 1)
+        else:
+            meal_count = np.ones(len(df), dtype=int)
+        
+        columns = (column(plan.order_number), formatted_date, name[:, 0], name[:, 1], address[:, 0], unit,
+                   address[:, 1], address[:, 2], address[:, 3], column(plan.phone),
+                   [str(count) for count in meal_count.tolist()], dropoff_instructions)
+        columns = [values.tolist() if isinstance(values, np.ndarray) else values for values in columns]
+        return list(map(DoorDashRecord._make, zip(*columns)))
+    
+    def iter_convert_records_pandas(self, plan, records, chunk_size=None):
+        """
+        Convert positional WorkWave records with the pandas engine.
+        Records are converted in chunks of chunk_size rows (all at once if None),
+        yielding each DoorDash row once its chunk is converted.
+        """
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if chunk_size and len(chunk) >= chunk_size:
+                for doordash_row in self.convert_dataframe(plan, self.records_to_dataframe(plan, chunk)):
+                    yield doordash_row
+                chunk = []
+        if chunk:
+            for doordash_row in self.convert_dataframe(plan, self.records_to_dataframe(plan, chunk)):
+                yield doordash_row
+    
+    def open_workwave_records(self, file_path, line_numbers=False):
+        """
+        Open a WorkWave CSV file and compile a conversion plan from its header.
+        Returns (plan, records) where records lazily yields each data row as a list,
+        or (line, row) pairs with the source line each row starts on if line_numbers is set.
+        """
+        try:
+            f = open_workwave_file(file_path)
+            reader = csv.reader(f)
+            header = next(reader, [])
+        except Exception as e:
+            raise Exception(f"Error reading WorkWave CSV file: {str(e)}")
+        
+        def records():
+            try:
+                if line_numbers:
+                    line = reader.line_num
+                    for record in reader:
+                        if record:
+                            yield line + 1, record
+                        line = reader.line_num
+                    return
+                for record in reader:
+                    # Skip blank lines like DictReader does
+                    if record:
+                        yield record
+            except Exception as e:
+                raise Exception(f"Error reading WorkWave CSV file: {str(e)}")
+            finally:
+                f.close()
+        
+        return self.build_conversion_plan(header), records()
+    
+    def read_workwave_csv(self, file_path):
+        """
+        Read WorkWave CSV file and return data as a list of dictionaries.
+        """
+        try:
+            with open_workwave_file(file_path) as f:
+                reader = csv.DictReader(f)
+                return list(reader)
+        except Exception as e:
+            raise Exception(f"Error reading WorkWave CSV file: {str(e)}")
+    
+    def write_doordash_csv(self, data, file_path, write_header=True, outputs=()):
+        """
+        Write DoorDash data to CSV file.
+        Accepts a list or any iterable of DoorDashRecord or row dictionaries;
+        returns the number of rows written. Records are written with csv.writer,
+        merging in the constant columns from row_layout().
+        Every row is also passed to the write() of each writer in outputs (see OUTPUT_FORMATS).
+        """
+        try:
+            count = 0
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                if write_header:
+                    csv.writer(f).writerow(self.doordash_fields)
+                rows = iter(data)
+                first = next(rows, None)
+                if first is None:
+                    return 0
+                rows = itertools.chain((first,), rows)
+                
+                if isinstance(first, dict):
+                    writer = csv.DictWriter(f, fieldnames=self.doordash_fields)
+                    for row in rows:
+                        writer.writerow(row)
+                        for output in outputs:
+                            output.write(tuple(row.get(field, '') for field in self.doordash_fields))
+                        count += 1
+                elif outputs:
+                    writerow = csv.writer(f).writerow
+                    layout = self.row_layout()
+                    writes = [output.write for output in outputs]
+                    for record in rows:
+                        row = layout(record)
+                        writerow(row)
+                        for write in writes:
+                            write(row)
+                        count += 1
+                else:
+                    writerow = csv.writer(f).writerow
+                    layout = self.row_layout()
+                    for record in rows:
+                        writerow(layout(record))
+                        count += 1
+            return count
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error writing DoorDash CSV file: {str(e)}")
+    
+    def convert_file(self, input_file, output_file, streaming=False, engine='python', summary=None, workers=None,
+                     progress=None, cancel_event=None, rejects_file=None, formats=()):
+        """
+        Convert WorkWave CSV file to DoorDash CSV file.
+        The output is written to a temporary file and only moved into place on success.
+        summary collects row counts, progress(rows_done, rows_total, stage) reports progress and
+        setting cancel_event stops the conversion with ConversionCancelled.
+        """
+        try:
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown conversion engine: {engine}")
+            # Invalid rows are split off into rejects_file in the same pass as the conversion
+            if rejects_file is not None and (engine != 'python' or (workers is not None and workers > 1)):
+                raise ValueError("Validation needs the python engine and a single worker")
+            # Extra copies of the output, e.g. ('jsonl', 'parquet'), written next to output_file
+            for output_format in formats:
+                if output_format not in OUTPUT_FORMATS:
+                    raise ValueError(f"Unknown output format: {output_format}")
+            formats = list(dict.fromkeys(formats))
+            if formats and workers is not None and workers > 1:
+                raise ValueError("Extra output formats need a single worker")
+            # Large files are split into byte ranges converted by workers processes;
+            # compressed exports cannot be split and are always converted by one process
+            parallel = workers is not None and workers > 1 and compressed_format(input_file) is None
+            
+            instrumentation = self.instrumentation
+            if instrumentation is not None:
+                instrumentation.reset()
+                if summary is None:
+                    summary = {}
+                self.install_instrumentation()
+                start = time.perf_counter()
+            
+            temp_file = temporary_path(output_file)
+            temp_rejects = temporary_path(rejects_file) if rejects_file is not None else None
+            format_files = {output_format_path(output_file, output_format): None for output_format in formats}
+            outputs = []
+            try:
+                for output_format, path in zip(formats, format_files):
+                    format_files[path] = temporary_path(path)
+                    outputs.append(OUTPUT_FORMATS[output_format](format_files[path], self.doordash_fields))
+                if parallel:
+                    count = self.convert_file_parallel(input_file, temp_file, workers, engine, summary,
+                                                       progress, cancel_event)
+                else:
+                    count = self.convert_file_serial(input_file, temp_file, streaming, engine, summary,
+                                                     progress, cancel_event, temp_rejects, outputs)
+                for output in outputs:
+                    output.close()
+                os.replace(temp_file, output_file)
+                if temp_rejects is not None:
+                    os.replace(temp_rejects, rejects_file)
+                for path, temp_path in format_files.items():
+                    os.replace(temp_path, path)
+            finally:
+                for output in outputs:
+                    output.close()
+                for path in [temp_file, temp_rejects] + list(format_files.values()):
+                    if path is not None and os.path.exists(path):
+                        os.remove(path)
+                if instrumentation is not None:
+                    self.remove_instrumentation()
+            
+            if instrumentation is not None:
+                instrumentation.finish(input_file=input_file, output_file=output_file, engine=engine,
+                                       streaming=streaming, workers=workers or 1,
+                                       seconds=time.perf_counter() - start, **summary)
+            return count
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Conversion error: {str(e)}")
+    
+    def convert_file_serial(self, input_file, output_file, streaming=False, engine='python', summary=None,
+                            progress=None, cancel_event=None, rejects_file=None, outputs=()):
+        """
+        Convert WorkWave CSV file to DoorDash CSV file in the current process.
+        Takes the same arguments as convert_file, but writes output_file and rejects_file directly
+        and passes every row to the open writers in outputs.
+        """
+        plan, records = self.open_workwave_records(input_file, line_numbers=rejects_file is not None)
+        if summary is not None:
+            records = count_rows(records, summary, 'rows_in')
+        
+        cache = self.cache if engine == 'python' else None
+        if cache is not None:
+            cache.validate(self.cache_fingerprints())
+            hits, misses = cache.hits, cache.misses
+        
+        total = 0
+        if progress is not None:
+            total = estimate_row_count(input_file)
+        
+        def track(rows, stage, stage_total):
+            if progress is None and cancel_event is None:
+                return rows
+            return track_progress(rows, stage, stage_total, progress, cancel_event)
+        
+        rejects = None
+        if engine == 'pandas':
+            chunk_size = PANDAS_CHUNK_SIZE if streaming else None
+            convert = lambda rows: self.iter_convert_records_pandas(plan, rows, chunk_size)
+        elif rejects_file is not None:
+            try:
+                rejects = open(rejects_file, 'w', newline='', encoding='utf-8')
+            except Exception as e:
+                raise Exception(f"Error writing rejects file: {str(e)}")
+            reject_writerow = csv.writer(rejects).writerow
+            reject_writerow(['Source Line', 'Reasons'] + plan.header)
+            reasons_count = collections.Counter()
+            rejected = 0
+            
+            def reject(line, record, reasons):
+                nonlocal rejected
+                rejected += 1
+                reasons_count.update(reasons)
+                reject_writerow([line, ';'.join(reasons)] + record)
+            convert = lambda rows: self.iter_convert_validated(plan, rows, reject)
+        else:
+            convert = lambda rows: self.iter_convert_records(plan, rows)
+        write = self.write_doordash_csv
+        if outputs:
+            write = functools.partial(write, outputs=outputs)
+        
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            # Time each stage; nested stages are subtracted from self_seconds
+            records = instrumentation.timed_iterator('read_workwave_csv', records)
+            convert_rows = convert
+            convert = lambda rows: instrumentation.timed_iterator('convert_workwave_to_doordash', convert_rows(rows))
+            write = instrumentation.timed('write_doordash_csv', write)
+        
+        try:
+            if streaming:
+                count = write(convert(track(records, 'converting', total)), output_file)
+            else:
+                # Read WorkWave data
+                workwave_data = list(track(records, 'reading', total))
+                
+                # Convert to DoorDash format
+                doordash_data = list(convert(track(workwave_data, 'converting', len(workwave_data))))
+                
+                # Write DoorDash data
+                write(track(doordash_data, 'writing', len(doordash_data)), output_file)
+                count = len(doordash_data)
+        finally:
+            if rejects is not None:
+                rejects.close()
+        
+        if rejects is not None and summary is not None:
+            summary['rows_rejected'] = rejected
+            summary['reject_reasons'] = dict(reasons_count.most_common())
+        
+        if cache is not None:
+            cache.flush()
+            if summary is not None:
+                summary['cache_hits'] = cache.hits - hits
+                summary['cache_misses'] = cache.misses - misses
+        if summary is not None:
+            summary['rows_out'] = count
+        if progress is not None:
+            progress(count, count, 'done')
+        return count
+    
+    def pickup_location_for(self, value):
+        """
+        Return the pickup location ID for a value of the pickup location column.
+        With a pickup_location_map, unmapped values use the default pickup location;
+        without one the value itself is the ID.
+        """
+        if self.pickup_location_map:
+            return self.pickup_location_map.get(value, self.pickup_location_id)
+        return value or self.pickup_location_id
+    
+    def convert_file_partitioned(self, input_file, output_file, split_by=('date',), max_rows=None,
+                                 max_open_files=DEFAULT_MAX_OPEN_FILES, summary=None, progress=None,
+                                 cancel_event=None):
+        """
+        Convert WorkWave CSV file into several DoorDash CSV files in a single pass.
+        Rows are split by 'date' (Date of Delivery) and/or 'location' (the pickup location taken from
+        pickup_location_column), and into shards of at most max_rows rows. Files are named after
+        output_file, e.g. routes_doordash_2025-09-02_ANGEL-1_part001.csv, and each has its own header.
+        When pickup_location_column is set every row gets its own pickup location ID.
+        Returns a list of (file path, row count) in the order the files were started.
+        """
+        for key in split_by:
+            if key not in PARTITION_KEYS:
+                raise ValueError(f"Unknown partition key: {key}")
+        
+        try:
+            plan, records = self.open_workwave_records(input_file)
+            location_index = None
+            if self.pickup_location_column is not None:
+                if self.pickup_location_column not in plan.header:
+                    raise ValueError(f"Pickup location column not found: {self.pickup_location_column}")
+                # Later duplicate column names win, as in ConversionPlan
+                location_index = len(plan.header) - 1 - plan.header[::-1].index(self.pickup_location_column)
+            
+            if summary is not None:
+                records = count_rows(records, summary, 'rows_in')
+            if progress is not None or cancel_event is not None:
+                total = estimate_row_count(input_file) if progress is not None else 0
+                records = track_progress(records, 'converting', total, progress, cancel_event)
+            
+            cache = self.cache
+            if cache is not None:
+                cache.validate(self.cache_fingerprints())
+            
+            writer = PartitionedWriter(self, output_file, split_by, max_rows, max_open_files)
+            locations = {}
+            convert_record = self.convert_record
+            write = writer.write
+            try:
+                for record in records:
+                    doordash_row = convert_record(plan, record)
+                    if doordash_row is None:
+                        continue
+                    location = self.pickup_location_id
+                    if location_index is not None:
+                        value = record[location_index] if location_index < len(record) else ''
+                        location = locations.get(value)
+                        if location is None:
+                            location = locations[value] = self.pickup_location_for(value)
+                    write(doordash_row, location)
+                files = writer.close()
+            except BaseException:
+                writer.abort()
+                raise
+            
+            if cache is not None:
+                cache.flush()
+            count = sum(rows for path, rows in files)
+            if summary is not None:
+                summary['rows_out'] = count
+                summary['files'] = len(files)
+            if progress is not None:
+                progress(count, count, 'done')
+            return files
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Conversion error: {str(e)}")
+    
+    def manifest_fingerprint(self, header):
+        """
+        Return a fingerprint of everything besides the WorkWave values that a written row depends on:
+        the settings, the field mapping and the export's header (which columns are read, including
+        Type and the 'lb|' meal columns), so an incremental run reconverts every order when they change.
+        """
+        return json.dumps([MANIFEST_VERSION, self.cache_fingerprints(), self.doordash_fields,
+                           self.constant_columns(), self.workwave_fields, list(header)])
+    
+    def convert_file_incremental(self, input_file, output_file, manifest_file=None, delta_file=None,
+                                 removed_file=None, summary=None, progress=None, cancel_event=None):
+        """
+        Convert WorkWave CSV file to DoorDash CSV file, reconverting only orders changed since the last run.
+        A manifest of a content hash and the converted row per Order Number is kept from run to run.
+        Besides the full output, writes a delta CSV with the new and changed orders and a CSV of the
+        Order IDs that are no longer in the export. Paths default to incremental_paths(output_file).
+        Returns (count, delta_count, removed_count).
+        """
+        default_manifest, default_delta, default_removed = incremental_paths(output_file)
+        manifest_file = manifest_file or default_manifest
+        delta_file = delta_file or default_delta
+        removed_file = removed_file or default_removed
+        if summary is None:
+            summary = {}
+        
+        try:
+            plan, records = self.open_workwave_records(input_file)
+            fingerprint = self.manifest_fingerprint(plan.header)
+            manifest = load_manifest(manifest_file)
+            previous = manifest.get('orders', {})
+            reuse = manifest.get('fingerprint') == fingerprint
+            
+            records = count_rows(records, summary, 'rows_in')
+            if progress is not None or cancel_event is not None:
+                total = estimate_row_count(input_file) if progress is not None else 0
+                records = track_progress(records, 'converting', total, progress, cancel_event)
+            
+            cache = self.cache
+            if cache is not None:
+                cache.validate(self.cache_fingerprints())
+            
+            orders = {}
+            delta = []
+            occurrences = collections.Counter()
+            summary['rows_converted'] = 0
+            
+            def convert_changed():
+                for record in records:
+                    record = plan.stop(record)
+                    if record is None:
+                        continue
+                    
+                    # Repeated order numbers are told apart by their position in the export
+                    order_id = plan.value(record, plan.order_number)
+                    occurrences[order_id] += 1
+                    key = order_id if occurrences[order_id] == 1 else f"{order_id}#{occurrences[order_id]}"
+                    
+                    digest = hashlib.blake2b('\x1f'.join(record).encode('utf-8'), digest_size=16).hexdigest()
+                    entry = previous.get(key)
+                    if reuse and entry is not None and entry[0] == digest:
+                        doordash_row = tuple(entry[1])
+                    else:
+                        doordash_row = self.convert_record(plan, record)
+                        summary['rows_converted'] += 1
+                        if not reuse or entry is None or list(doordash_row) != entry[1]:
+                            delta.append(doordash_row)
+                    orders[key] = [digest, list(doordash_row)]
+                    yield doordash_row
+            
+            temp_files = {path: temporary_path(path) for path in (output_file, delta_file, removed_file)}
+            try:
+                count = self.write_doordash_csv(convert_changed(), temp_files[output_file])
+                self.write_doordash_csv(delta, temp_files[delta_file])
+                
+                removed = list(dict.fromkeys(entry[1][0] for key, entry in previous.items() if key not in orders))
+                with open(temp_files[removed_file], 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['Order ID*'])
+                    writer.writerows([order_id] for order_id in removed)
+                
+                for path, temp_file in temp_files.items():
+                    os.replace(temp_file, path)
+            finally:
+                for temp_file in temp_files.values():
+                    if os.path.exists(temp_file):
+                        os.remove(temp_file)
+            
+            # Only remember this run once every output is in place
+            save_manifest(manifest_file, {'version': MANIFEST_VERSION, 'fingerprint': fingerprint,
+                                          'orders': orders})
+            if cache is not None:
+                cache.flush()
+            
+            summary['rows_out'] = count
+            summary['delta_rows'] = len(delta)
+            summary['removed_orders'] = len(removed)
+            if progress is not None:
+                progress(count, count, 'done')
+            return count, len(delta), len(removed)
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Conversion error: {str(e)}")
+    
+    def convert_files_merged(self, input_files, output_file, policy='last', conflicts_file=None, summary=None,
+                             progress=None, cancel_event=None):
+        """
+        Merge several WorkWave CSV files into one DoorDash CSV file, de-duplicated by Order Number.
+        Files are read one after the other into a dict keyed by Order Number that only holds the
+        converted row currently kept for each order, so the merge is a single pass over all rows and
+        memory grows with the number of distinct orders. Identical duplicates are dropped; orders
+        whose contents differ are resolved by policy:
+        'last' keeps the version from the last file, 'window' keeps the version with the latest
+        delivery date and time window (the last file on a tie), and 'flag' leaves the order out and
+        writes every version with its source file and line to conflicts_file
+        (default merge_conflicts_path(output_file)).
+        Orders keep the position they first appeared at. Rows without an Order Number are all kept.
+        Returns the number of orders written.
+        """
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy: {policy}")
+        conflicts_file = (conflicts_file or merge_conflicts_path(output_file)) if policy == 'flag' else None
+        if summary is None:
+            summary = {}
+        
+        try:
+            cache = self.cache
+            if cache is not None:
+                cache.validate(self.cache_fingerprints())
+            
+            def numbered_records():
+                for file_index, input_file in enumerate(input_files):
+                    plan, records = self.open_workwave_records(input_file, line_numbers=True)
+                    occurrences = collections.Counter()
+                    for line, record in records:
+                        record = plan.stop(record)
+                        if record is None:
+                            continue
+                        doordash_row = self.convert_record(plan, record)
+                        
+                        # Repeated order numbers within one export are separate orders
+                        order_id = doordash_row.order_id
+                        occurrences[order_id] += 1
+                        if not order_id:
+                            key = (file_index, line)
+                        elif occurrences[order_id] == 1:
+                            key = order_id
+                        else:
+                            key = f"{order_id}#{occurrences[order_id]}"
+                        
+                        window = None
+                        if policy == 'window':
+                            window = time_window_key(doordash_row.date_of_delivery,
+                                                     plan.value(record, plan.time_window_start),
+                                                     plan.value(record, plan.time_window_end))
+                        yield key, (doordash_row, file_index, line, window)
+            
+            rows = count_rows(numbered_records(), summary, 'rows_in')
+            if progress is not None or cancel_event is not None:
+                total = sum(estimate_row_count(path) for path in input_files) if progress is not None else 0
+                rows = track_progress(rows, 'merging', total, progress, cancel_event)
+            
+            orders = {}
+            conflicts = {}
+            duplicates = 0
+            for key, entry in rows:
+                kept = orders.get(key)
+                if kept is None:
+                    orders[key] = entry
+                    continue
+                duplicates += 1
+                if policy == 'flag':
+                    versions = conflicts.get(key)
+                    if versions is None:
+                        if entry[0] != kept[0]:
+                            conflicts[key] = [kept, entry]
+                    elif all(entry[0] != version[0] for version in versions):
+                        versions.append(entry)
+                elif entry[0] != kept[0]:
+                    conflicts[key] = True
+                    if policy == 'last' or entry[3] >= kept[3]:
+                        orders[key] = entry
+            
+            temp_file = temporary_path(output_file)
+            temp_conflicts = temporary_path(conflicts_file) if conflicts_file is not None else None
+            try:
+                count = self.write_doordash_csv((entry[0] for key, entry in orders.items()
+                                                 if policy != 'flag' or key not in conflicts), temp_file)
+                if temp_conflicts is not None:
+                    layout = self.row_layout()
+                    with open(temp_conflicts, 'w', newline='', encoding='utf-8') as f:
+                        writer = csv.writer(f)
+                        writer.writerow(['Source File', 'Source Line'] + self.doordash_fields)
+                        for versions in conflicts.values():
+                            if versions is not True:
+                                writer.writerows([input_files[file_index], line] + list(layout(doordash_row))
+                                                 for doordash_row, file_index, line, window in versions)
+                os.replace(temp_file, output_file)
+                if temp_conflicts is not None:
+                    os.replace(temp_conflicts, conflicts_file)
+            finally:
+                for path in (temp_file, temp_conflicts):
+                    if path is not None and os.path.exists(path):
+                        os.remove(path)
+            if cache is not None:
+                cache.flush()
+            
+            summary['files'] = len(input_files)
+            summary['rows_out'] = count
+            summary['duplicates'] = duplicates
+            summary['conflicts'] = len(conflicts)
+            if progress is not None:
+                progress(count, count, 'done')
+            return count
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Merge error: {str(e)}")
+    
+    def read_workwave_chunks(self, file_path, chunk_count):
+        """
+        Memory-map a WorkWave CSV file and split it into byte ranges on record boundaries.
+        Returns (header, ranges) where ranges is a list of (start, end) byte offsets
+        covering the data rows in order. Newlines inside quoted fields are never split.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return [], []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start = len(codecs.BOM_UTF8) if mm[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+                    header_end = next_record_boundary(mm, start, False)[0]
+                    header_text = mm[start:header_end].decode('utf-8')
+                    header = next(csv.reader(io.StringIO(header_text, newline=None)), [])
+                    return header, split_records(mm, header_end, chunk_count)
+        except Exception as e:
+            raise Exception(f"Error reading WorkWave CSV file: {str(e)}")
+    
+    def convert_file_parallel(self, input_file, output_file, workers=None, engine='python', summary=None,
+                              progress=None, cancel_event=None):
+        """
+        Convert one large WorkWave CSV file using several worker processes.
+        The file is memory-mapped and split into byte ranges of at most MAX_PARALLEL_CHUNK_BYTES
+        on quote-aware record boundaries; each range is read in pieces and converted by a worker
+        into a temporary part file, and the parts are joined in the original row order.
+        The output is identical to convert_file.
+        Progress is reported and cancellation checked as each chunk finishes.
+        """
+        workers = workers or os.cpu_count() or 1
+        try:
+            size = os.path.getsize(input_file)
+        except OSError as e:
+            raise Exception(f"Error reading WorkWave CSV file: {str(e)}")
+        chunk_count = max(1, min(max(workers, -(-size // MAX_PARALLEL_CHUNK_BYTES)), size // MIN_PARALLEL_CHUNK_BYTES))
+        header, ranges = self.read_workwave_chunks(input_file, chunk_count)
+        
+        part_dir = tempfile.mkdtemp(prefix='.doordash_parts_', dir=os.path.dirname(os.path.abspath(output_file)))
+        try:
+            part_files = [os.path.join(part_dir, f"part{index}.csv") for index in range(len(ranges))]
+            jobs = [(input_file, header, start, end, part_file, engine)
+                    for (start, end), part_file in zip(ranges, part_files)]
+            
+            total = estimate_row_count(input_file) if progress is not None else 0
+            if len(jobs) <= 1:
+                counts = [convert_byte_range(self, *job) for job in jobs]
+            else:
+                from concurrent.futures import ProcessPoolExecutor, as_completed
+                with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                    futures = [executor.submit(convert_byte_range, self, *job) for job in jobs]
+                    rows_done = 0
+                    try:
+                        for future in as_completed(futures):
+                            rows_done += future.result()[0]
+                            if cancel_event is not None and cancel_event.is_set():
+                                raise ConversionCancelled("Conversion cancelled.")
+                            if progress is not None:
+                                progress(rows_done, max(total, rows_done), 'converting')
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+                    counts = [future.result() for future in futures]
+            
+            # Join the parts in the original row order
+            self.write_doordash_csv([], output_file)
+            with open(output_file, 'ab') as out:
+                for part_file in part_files:
+                    with open(part_file, 'rb') as part:
+                        shutil.copyfileobj(part, out)
+        finally:
+            shutil.rmtree(part_dir, ignore_errors=True)
+        
+        rows_out = sum(count[1] for count in counts)
+        if summary is not None:
+            summary['rows_in'] = sum(count[0] for count in counts)
+            summary['rows_out'] = rows_out
+        if progress is not None:
+            progress(rows_out, rows_out, 'done')
+        return rows_out
+    
+    def convert_batch(self, input_files, output_dir=None, workers=None, streaming=True, engine='python'):
+        """
+        Convert many WorkWave CSV files across a pool of worker processes.
+        Output files are named <input>_doordash.csv, in output_dir if given.
+        Returns one summary per input file, in input order, with the keys
+        input_file, output_file, rows_in, rows_out, duration and error.
+        A file that fails to convert is reported in its summary and does not stop the others.
+        Inputs that would write the same output file, e.g. routes.csv and routes.csv.gz, are all
+        reported as failed and none of them is converted, so no output silently replaces another.
+        """
+        jobs = []
+        for input_file in input_files:
+            output_file = default_output_path(input_file)
+            if output_dir:
+                output_file = os.path.join(output_dir, os.path.basename(output_file))
+            jobs.append((input_file, output_file))
+        
+        sources = collections.defaultdict(list)
+        for input_file, output_file in jobs:
+            sources[os.path.normcase(os.path.abspath(output_file))].append(input_file)
+        summaries = [None] * len(jobs)
+        pending = []
+        for index, (input_file, output_file) in enumerate(jobs):
+            others = [other for other in sources[os.path.normcase(os.path.abspath(output_file))] if other != input_file]
+            if others:
+                summaries[index] = batch_summary(input_file, output_file,
+                                                 error=f"{output_file} would also be written from {', '.join(others)}")
+            else:
+                pending.append(index)
+        
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        if workers == 1 or len(pending) <= 1:
+            for index in pending:
+                summaries[index] = convert_batch_item(self, *jobs[index], streaming, engine)
+            return summaries
+        
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(convert_batch_item, self, *jobs[index], streaming, engine) for index in pending]
+            for index, future in zip(pending, futures):
+                try:
+                    summaries[index] = future.result()
+                except Exception as e:
+                    # The worker process itself failed, e.g. it was killed
+                    summaries[index] = batch_summary(*jobs[index], error=str(e))
+        return summaries
+
+
+def next_record_boundary(mm, pos, in_quotes):
+    """
+    Return (offset, in_quotes) for the first CSV record boundary at or after pos.
+    in_quotes is the quote state at pos; a newline ends a record only outside quotes.
+    The offset is just past the newline, or the end of the file.
+    """
+    size = len(mm)
+    while pos < size:
+        newline = mm.find(b'\n', pos)
+        if newline == -1:
+            return size, in_quotes
+        # Escaped quotes ("") come in pairs, so only the parity matters
+        if mm[pos:newline].count(b'"') % 2:
+            in_quotes = not in_quotes
+        pos = newline + 1
+        if not in_quotes:
+            return pos, in_quotes
+    return size, in_quotes
+
+
+def split_records(mm, start, chunk_count):
+    """
+    Split mm[start:] into at most chunk_count byte ranges that end on record boundaries.
+    Quote parity is tracked in fixed-size blocks so the file is never copied whole.
+    """
+    size = len(mm)
+    chunk_size = max(1, (size - start) // max(1, chunk_count))
+    ranges = []
+    pos = start
+    in_quotes = False
+    while pos < size:
+        target = min(size, pos + chunk_size)
+        # Track the quote state up to the target
+        scan = pos
+        while scan < target:
+            block_end = min(target, scan + QUOTE_SCAN_BLOCK_BYTES)
+            if mm[scan:block_end].count(b'"') % 2:
+                in_quotes = not in_quotes
+            scan = block_end
+        
+        if len(ranges) == chunk_count - 1 or target >= size:
+            end = size
+        elif not in_quotes and mm[target - 1:target] == b'\n':
+            end = target
+        else:
+            end, in_quotes = next_record_boundary(mm, target, in_quotes)
+        ranges.append((pos, end))
+        pos = end
+        in_quotes = False
+    return ranges
+
+
+class ByteRangeFile(io.RawIOBase):
+    """
+    Raw reader over the bytes from start to end of an unbuffered binary file,
+    so a byte range can be decoded in pieces without copying it into memory.
+    """
+    
+    def __init__(self, f, start, end):
+        f.seek(start)
+        self.f = f
+        self.remaining = end - start
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        count = self.f.readinto(memoryview(buffer)[:size])
+        self.remaining -= count
+        return count
+
+
+def convert_byte_range(converter, input_file, header, start, end, part_file, engine='python'):
+    """
+    Convert the records in a byte range of a WorkWave CSV file into a DoorDash part file
+    without a header. Runs in a worker process; returns (rows_in, rows_out).
+    """
+    with open(input_file, 'rb', buffering=0) as f:
+        # Decode like the serial reader, including universal newline translation
+        text = io.TextIOWrapper(io.BufferedReader(ByteRangeFile(f, start, end)), encoding='utf-8')
+        summary = {}
+        records = count_rows((record for record in csv.reader(text) if record), summary, 'rows_in')
+        plan = converter.build_conversion_plan(header)
+        if engine == 'pandas':
+            rows = converter.iter_convert_records_pandas(plan, records, PANDAS_CHUNK_SIZE)
+        else:
+            rows = converter.iter_convert_records(plan, records)
+        rows_out = converter.write_doordash_csv(rows, part_file, write_header=False)
+    return summary['rows_in'], rows_out
+
+
+@functools.lru_cache(maxsize=DATE_TIME_MEMO_SIZE)
+def format_date_value(date_str):
+    """
+    Convert date from MM/DD/YYYY to YYYY-MM-DD, returning invalid dates unchanged.
+    Exact MM/DD/YYYY strings are parsed by hand; anything else goes through strptime.
+    Results are memoized, as an export usually has only a few distinct dates.
+    """
+    if not date_str or date_str.strip() == "":
+        return ""
+    
+    # Fast path for the exact MM/DD/YYYY shape
+    if (len(date_str) == 10 and date_str[2] == '/' and date_str[5] == '/' and date_str.isascii()
+            and date_str[:2].isdigit() and date_str[3:5].isdigit() and date_str[6:].isdigit()):
+        month = int(date_str[:2])
+        day = int(date_str[3:5])
+        year = int(date_str[6:])
+        # Years below 1000 are left to strftime, whose padding is platform dependent
+        if year >= 1000 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]:
+            return f"{date_str[6:]}-{date_str[:2]}-{date_str[3:5]}"
+        if year >= 1000:
+            return date_str
+    
+    try:
+        date_obj = datetime.strptime(date_str, "%m/%d/%Y")
+        return date_obj.strftime("%Y-%m-%d")
+    except ValueError:
+        return date_str
+
+
+@functools.lru_cache(maxsize=DATE_TIME_MEMO_SIZE)
+def format_time_value(time_str):
+    """
+    Convert time from "HH:MM AM/PM" to "HH:MM:SS", returning invalid times unchanged.
+    Exact HH:MM AM/PM strings are parsed by hand; anything else goes through strptime.
+    Results are memoized, as an export usually has only a few dozen distinct times.
+    """
+    if not time_str or time_str.strip() == "":
+        return ""
+    
+    # Fast path for the exact HH:MM AM/PM shape
+    if (len(time_str) == 8 and time_str[2] == ':' and time_str[5] == ' ' and time_str.isascii()
+            and time_str[:2].isdigit() and time_str[3:5].isdigit()):
+        hour = int(time_str[:2])
+        minute = int(time_str[3:5])
+        meridiem = time_str[6:].upper()
+        if 1 <= hour <= 12 and minute <= 59 and meridiem in ('AM', 'PM'):
+            hour = hour % 12 + (12 if meridiem == 'PM' else 0)
+            return f"{hour:02d}:{time_str[3:5]}:00"
+    
+    try:
+        time_obj = datetime.strptime(time_str, "%I:%M %p")
+        return time_obj.strftime("%H:%M:%S")
+    except ValueError:
+        return time_str
+
+
+class ConversionCancelled(Exception):
+    """Raised when a conversion is cancelled through its cancel_event."""
+
+
+def temporary_path(file_path):
+    """Return a unique temporary path next to file_path, used to write it atomically."""
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def incremental_paths(output_file):
+    """Return the default (manifest, delta, removed) paths of an incremental conversion to output_file."""
+    base = os.path.splitext(output_file)[0]
+    return f"{base}.manifest.json", f"{base}_delta.csv", f"{base}_removed.csv"
+
+
+def time_window_key(date, start, end):
+    """
+    Return a sortable key of a delivery date and a WorkWave time window.
+    Dates and times that cannot be parsed sort before every valid one.
+    """
+    date = date if VALIDATION_FORMATS['date_of_delivery'].match(date) else ''
+    start, end = format_time_value(start), format_time_value(end)
+    return (date, start if TIME_KEY.match(start) else '', end if TIME_KEY.match(end) else '')
+
+
+def compressed_format(file_path):
+    """Return 'gzip' or 'zip' if file_path is a compressed file, judged by its first bytes, else None."""
+    try:
+        with open(file_path, 'rb') as f:
+            magic = f.read(len(ZIP_MAGIC))
+    except OSError:
+        return None
+    if magic.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if magic == ZIP_MAGIC:
+        return 'zip'
+    return None
+
+
+def open_workwave_file(file_path):
+    """
+    Open a WorkWave export as text. gzip files and zip archives holding a single CSV file
+    are decompressed as they are read, without writing the CSV to disk.
+    """
+    kind = compressed_format(file_path)
+    if kind == 'gzip':
+        import gzip
+        return io.TextIOWrapper(io.BufferedReader(gzip.GzipFile(file_path), GZIP_BUFFER_BYTES), encoding='utf-8-sig')
+    if kind == 'zip':
+        import zipfile
+        with zipfile.ZipFile(file_path) as archive:
+            names = [name for name in archive.namelist()
+                     if name.lower().endswith('.csv') and not name.startswith('__MACOSX/')]
+            if len(names) != 1:
+                raise ValueError(f"Expected one CSV file in {file_path}, found {len(names)}")
+            # The member stays readable after the archive is closed
+            return io.TextIOWrapper(archive.open(names[0]), encoding='utf-8-sig')
+    return open(file_path, 'r', encoding='utf-8-sig')
+
+
+def output_format_path(output_file, output_format):
+    """Return the path an extra output format is written to next to output_file."""
+    return os.path.splitext(output_file)[0] + OUTPUT_FORMATS[output_format].suffix
+
+
+def merge_conflicts_path(output_file):
+    """Return the default conflicts file of a merge into output_file."""
+    return f"{os.path.splitext(output_file)[0]}_conflicts.csv"
+
+
+def rejects_path(output_file):
+    """Return the default rejects file of a validated conversion to output_file."""
+    return f"{os.path.splitext(output_file)[0]}_rejects.csv"
+
+
+def reason_code(field):
+    """Return the reason code name of a DoorDash column, e.g. 'Pickup Location ID*' -> 'pickup_location_id'."""
+    return re.sub(r'\W+', '_', field.rstrip('*').lower()).strip('_')
+
+
+def validation_reasons(record, required):
+    """
+    Return the reason codes of a DoorDashRecord that failed the fast validation check.
+    required lists the (index, name, reason code) of the required record fields. An address that
+    could not be split into city, state and ZIP is reported once as unparsed_address.
+    """
+    unparsed = bool(record.street.strip()) and not (record.city.strip() or record.state.strip()
+                                                    or record.zip_code.strip())
+    reasons = ['unparsed_address'] if unparsed else []
+    for index, name, code in required:
+        value = record[index]
+        if not value.strip():
+            if not (unparsed and name in ('city', 'state', 'zip_code')):
+                reasons.append(f"missing_{code}")
+        elif name in VALIDATION_FORMATS and not VALIDATION_FORMATS[name].match(value):
+            reasons.append(f"invalid_{code}")
+    return reasons
+
+
+def format_reject_summary(summary, rejects_file):
+    """Return a one-line description of the rows a validated conversion rejected."""
+    rejected = summary.get('rows_rejected', 0)
+    if not rejected:
+        return "Validation: all rows passed"
+    reasons = ', '.join(f"{reason} {count}" for reason, count in summary.get('reject_reasons', {}).items())
+    return f"Validation: {rejected} rows rejected ({reasons}), saved to: {rejects_file}"
+
+
+def load_manifest(file_path):
+    """
+    Load an incremental conversion manifest. A missing, unreadable or outdated manifest
+    is treated as empty, so every order is converted and reported as new.
+    """
+    try:
+        with open(file_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_manifest(file_path, manifest):
+    """Write an incremental conversion manifest atomically."""
+    temp_file = temporary_path(file_path)
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            # json.dumps uses the C encoder, json.dump does not
+            f.write(json.dumps(manifest, separators=(',', ':')))
+        os.replace(temp_file, file_path)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def estimate_row_count(file_path):
+    """
+    Estimate the number of data rows in a CSV file by counting its newlines.
+    Quoted multi-line fields make this an upper bound. Compressed files are not
+    scanned and return 0, i.e. unknown.
+    """
+    if compressed_format(file_path) is not None:
+        return 0
+    lines = 0
+    last = b'\n'
+    try:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(QUOTE_SCAN_BLOCK_BYTES), b''):
+                lines += block.count(b'\n')
+                last = block[-1:]
+    except OSError:
+        return 0
+    if last != b'\n':
+        lines += 1
+    return max(0, lines - 1)
+
+
+def track_progress(rows, stage, total, progress=None, cancel_event=None):
+    """
+    Yield rows unchanged, reporting progress(rows_done, total, stage) every
+    PROGRESS_INTERVAL rows and raising ConversionCancelled once cancel_event is set.
+    """
+    done = 0
+    if progress is not None:
+        progress(0, total, stage)
+    for row in rows:
+        yield row
+        done += 1
+        if done % PROGRESS_INTERVAL == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ConversionCancelled("Conversion cancelled.")
+            if progress is not None:
+                progress(done, max(total, done), stage)
+    if cancel_event is not None and cancel_event.is_set():
+        raise ConversionCancelled("Conversion cancelled.")
+    if progress is not None:
+        progress(done, done, stage)
+
+
+def count_rows(rows, summary, key):
+    """Yield rows unchanged while counting them into summary[key]."""
+    summary[key] = 0
+    for row in rows:
+        summary[key] += 1
+        yield row
+
+
+def batch_summary(input_file, output_file, rows_in=0, rows_out=0, duration=0.0, error=None):
+    """Return the summary of one file in a batch conversion."""
+    return {
+        'input_file': input_file,
+        'output_file': output_file,
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'duration': duration,
+        'error': error
+    }
+
+
+def convert_batch_item(converter, input_file, output_file, streaming=True, engine='python'):
+    """
+    Convert one file of a batch and return its summary.
+    Runs in a worker process, so errors are reported instead of raised.
+    """
+    summary = {}
+    start = time.perf_counter()
+    try:
+        converter.convert_file(input_file, output_file, streaming=streaming, engine=engine, summary=summary)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return batch_summary(input_file, output_file, summary.get('rows_in', 0), summary.get('rows_out', 0),
+                         time.perf_counter() - start, error)
+
+
+def format_batch_summary(summary):
+    """Return a one-line report of a converted file."""
+    if summary['error']:
+        return f"FAILED {summary['input_file']}: {summary['error']}"
+    return (f"OK     {summary['input_file']} -> {summary['output_file']}: "
+            f"{summary['rows_in']} rows in, {summary['rows_out']} orders out, {summary['duration']:.2f}s")
+
+
+def expand_input_paths(paths):
+    """
+    Expand directories and glob patterns into a sorted list of WorkWave CSV files.
+    Directories contribute their *.csv, *.csv.gz and *.zip files, skipping converted
+    *_doordash.csv and *_doordash.csv.gz outputs.
+    """
+    input_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = [match for pattern in ('*.csv', '*.csv.gz', '*.zip')
+                       for match in glob.glob(os.path.join(path, pattern))]
+            matches = [match for match in matches if not match.endswith(('_doordash.csv', '_doordash.csv.gz'))]
+        elif glob.has_magic(path):
+            matches = glob.glob(path)
+        else:
+            matches = [path]
+        for match in sorted(matches):
+            if match not in input_files:
+                input_files.append(match)
+    return input_files
+
+
+# Per-row DoorDash fields; the remaining columns are constants taken from the converter settings
+DoorDashRecord = collections.namedtuple('DoorDashRecord', [
+    'order_id', 'date_of_delivery', 'first_name', 'last_initial', 'street', 'unit', 'city', 'state',
+    'zip_code', 'phone', 'num_items', 'dropoff_instructions'
+])
+
+# DoorDash columns filled from DoorDashRecord fields
+RECORD_COLUMNS = {
+    'Order ID*': 'order_id',
+    'Date of Delivery*': 'date_of_delivery',
+    'Client First Name*': 'first_name',
+    'Client Last Name*': 'last_initial',
+    'Client Street Address*': 'street',
+    'Client Unit': 'unit',
+    'Client City*': 'city',
+    'Client State*': 'state',
+    'Client ZIP*': 'zip_code',
+    'Client Phone*': 'phone',
+    'Number of Items*': 'num_items',
+    'Dropoff Instructions (250 character max)': 'dropoff_instructions'
+}
+
+
+class ConversionPlan:
+    """
+    Column positions for a WorkWave CSV, resolved once from its header.
+    Lets rows be converted as positional lists instead of dictionaries.
+    """
+    
+    def __init__(self, header, workwave_fields):
+        # Later duplicate column names win, matching csv.DictReader
+        index = {}
+        for position, column in enumerate(header):
+            index[column] = position
+        
+        self.header = list(header)
+        self.width = len(header)
+        self.address = index.get(workwave_fields['address'])
+        self.unit = index.get(workwave_fields['unit'])
+        self.unit_info = index.get(workwave_fields['unit_info'])
+        self.date = index.get(workwave_fields['date'])
+        self.order_number = index.get(workwave_fields['order_number'])
+        self.name = index.get(workwave_fields['name'])
+        self.notes = index.get(workwave_fields['notes'])
+        self.phone = index.get(workwave_fields['phone'])
+        self.time_window_start = index.get(workwave_fields['time_window_start'])
+        self.time_window_end = index.get(workwave_fields['time_window_end'])
+        self.type = index.get('Type')
+        
+        # Meal columns start with 'lb|'
+        self.meals = [position for column, position in index.items() if column.startswith('lb|')]
+    
+    def stop(self, record):
+        """
+        Return a record padded to the header width, or None if it is not a stop to deliver to
+        (header, empty and departure rows).
+        """
+        # Pad short records the same way DictReader fills missing fields
+        if len(record) < self.width:
+            record = list(record) + [''] * (self.width - len(record))
+        
+        # Skip header row or empty rows
+        address = record[self.address] if self.address is not None else ''
+        if not address or address == 'Address':
+            return None
+        
+        # Skip departure rows
+        if self.type is not None and record[self.type].lower() == 'departure':
+            return None
+        return record
+    
+    @staticmethod
+    def value(record, position):
+        """Return the value at a column position, or '' if the column is missing."""
+        return record[position] if position is not None else ''
+
+
+class Instrumentation:
+    """
+    Opt-in timings and counters for conversions.
+    Set converter.instrumentation = Instrumentation() to enable it. During convert_file the
+    read, convert and write stages and each per-row helper are timed (call counts, cumulative
+    seconds, and self_seconds excluding nested stages and helpers), and fallback paths
+    are counted, e.g. parse_address.regex_miss or format_date.invalid. At the end a
+    JSON-serializable report is stored in .report and passed to every hook:
+    
+        instrumentation.add_hook(lambda report: statsd.timing('convert', report['seconds']))
+    
+    Per-row helper timings are only collected in the main process; -j workers and the
+    pandas engine call helpers per distinct value or not at all.
+    """
+    
+    def __init__(self):
+        self.hooks = []
+        self.stack = []
+        self.reset()
+    
+    def reset(self):
+        """Clear timings and counters before a conversion."""
+        # name -> [calls, seconds, seconds spent in nested timings]
+        self.timings = {}
+        self.counters = {}
+        del self.stack[:]
+        self.report = None
+    
+    def add_hook(self, hook):
+        """Call hook(report) at the end of every instrumented conversion."""
+        self.hooks.append(hook)
+    
+    def count(self, name, amount=1):
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def timed(self, name, function):
+        """Return function wrapped to record its calls and time under name."""
+        timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+        stack = self.stack
+        clock = time.perf_counter
+        
+        def wrapper(*args, **kwargs):
+            stack.append(0.0)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                timing[0] += 1
+                timing[1] += elapsed
+                timing[2] += stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+        return wrapper
+    
+    def timed_iterator(self, name, iterable):
+        """Yield items from iterable, recording the time spent producing them under name."""
+        timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+        stack = self.stack
+        clock = time.perf_counter
+        iterator = iter(iterable)
+        while True:
+            stack.append(0.0)
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = clock() - start
+                timing[1] += elapsed
+                timing[2] += stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+            timing[0] += 1
+            yield item
+    
+    def count_unchanged(self, name, function):
+        """Return function wrapped to count calls whose non-empty result equals the input."""
+        def wrapper(value):
+            result = function(value)
+            if result and result == value:
+                self.count(name)
+            return result
+        return wrapper
+    
+    def finish(self, **info):
+        """Build the report for the finished conversion and pass it to the hooks."""
+        report = dict(info)
+        report['timings'] = {
+            name: {'calls': calls, 'seconds': seconds, 'self_seconds': seconds - nested}
+            for name, (calls, seconds, nested) in self.timings.items()
+        }
+        report['counters'] = dict(self.counters)
+        self.report = report
+        for hook in self.hooks:
+            hook(report)
+        return report
+
+
+class ParseCache:
+    """
+    Persistent SQLite cache of parsed addresses, names and dropoff notes, keyed by the raw strings.
+    Entries are loaded into memory when the cache is opened and written back by flush(),
+    so lookups during a conversion never touch the database. Each kind holds at most
+    max_entries entries; the least recently used ones are evicted on flush.
+    """
+    
+    KINDS = ('address', 'name', 'notes')
+    
+    def __init__(self, path, max_entries=DEFAULT_CACHE_ENTRIES):
+        import sqlite3
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        try:
+            # Conversions run on a GUI worker thread, one at a time
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (kind, key)
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_used ON entries (kind, last_used);
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            ''')
+            self.clock = int(self.get_meta('clock', '0'))
+            self.entries = {}
+            for kind in self.KINDS:
+                self.load(kind)
+        except Exception as e:
+            raise Exception(f"Error opening cache {path}: {str(e)}")
+        self.used = {kind: set() for kind in self.KINDS}
+        self.added = {kind: set() for kind in self.KINDS}
+    
+    def load(self, kind):
+        """Load the most recently used entries of a kind into memory."""
+        rows = self.connection.execute(
+            'SELECT key, value FROM entries WHERE kind = ? ORDER BY last_used DESC LIMIT ?',
+            (kind, self.max_entries))
+        self.entries[kind] = {key: self.decode(value) for key, value in rows}
+    
+    @staticmethod
+    def decode(value):
+        """Decode a stored value; tuples are stored as JSON lists."""
+        value = json.loads(value)
+        return tuple(value) if isinstance(value, list) else value
+    
+    def get_meta(self, name, default=None):
+        """Return a value from the meta table."""
+        row = self.connection.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else default
+    
+    def set_meta(self, name, value):
+        """Store a value in the meta table."""
+        self.connection.execute('INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)', (name, value))
+    
+    def get(self, kind, key, compute):
+        """Return the cached result for key, computing and caching it on a miss."""
+        if not key:
+            return compute(key)
+        entries = self.entries[kind]
+        try:
+            value = entries[key]
+        except KeyError:
+            value = entries[key] = compute(key)
+            self.added[kind].add(key)
+            self.misses += 1
+            return value
+        self.used[kind].add(key)
+        self.hits += 1
+        return value
+    
+    def validate(self, fingerprints):
+        """Drop every kind whose stored fingerprint differs from the given one."""
+        with self.connection:
+            for kind, fingerprint in fingerprints.items():
+                if self.get_meta(f"fingerprint:{kind}") != fingerprint:
+                    self.connection.execute('DELETE FROM entries WHERE kind = ?', (kind,))
+                    self.entries[kind] = {}
+                    self.used[kind] = set()
+                    self.added[kind] = set()
+                    self.set_meta(f"fingerprint:{kind}", fingerprint)
+    
+    def flush(self):
+        """Write new entries and usage back to the database and evict the least recently used."""
+        self.clock += 1
+        try:
+            with self.connection:
+                for kind in self.KINDS:
+                    entries = self.entries[kind]
+                    self.connection.executemany(
+                        'INSERT OR REPLACE INTO entries (kind, key, value, last_used) VALUES (?, ?, ?, ?)',
+                        ((kind, key, json.dumps(entries[key]), self.clock) for key in self.added[kind]))
+                    self.connection.executemany(
+                        'UPDATE entries SET last_used = ? WHERE kind = ? AND key = ?',
+                        ((self.clock, kind, key) for key in self.used[kind] - self.added[kind]))
+                    self.connection.execute(
+                        '''DELETE FROM entries WHERE kind = ? AND key NOT IN (
+                               SELECT key FROM entries WHERE kind = ? ORDER BY last_used DESC LIMIT ?)''',
+                        (kind, kind, self.max_entries))
+                    self.used[kind] = set()
+                    self.added[kind] = set()
+                self.set_meta('clock', str(self.clock))
+            
+            # Drop evicted entries from memory too
+            for kind in self.KINDS:
+                if len(self.entries[kind]) > self.max_entries:
+                    self.load(kind)
+        except Exception as e:
+            raise Exception(f"Error writing cache {self.path}: {str(e)}")
+    
+    def stats(self):
+        """Return a one-line summary of cache hits and misses."""
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+    
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class PartitionedWriter:
+    """
+    Route DoorDash records to one CSV file per partition in a single pass.
+    Partitions are keyed by delivery date and/or pickup location, and a partition that reaches
+    max_rows rows continues in a new shard. Each shard gets its own header and is written to a
+    temporary file that is moved into place by close(). At most max_open_files files are open at
+    once; the least recently used one is closed and reopened for appending when needed.
+    """
+    
+    def __init__(self, converter, output_file, split_by=('date',), max_rows=None,
+                 max_open_files=DEFAULT_MAX_OPEN_FILES):
+        self.converter = converter
+        self.base = os.path.splitext(output_file)[0]
+        self.by_date = 'date' in split_by
+        self.by_location = 'location' in split_by
+        self.max_rows = max_rows
+        self.max_open_files = max(1, max_open_files)
+        self.partitions = {}   # partition key -> [index of its current shard in files, shard number]
+        self.files = []        # [path, temporary path, rows, pickup location] per shard, in order started
+        self.handles = collections.OrderedDict()  # shard index -> (file, writerow), least recently used first
+        self.layouts = {}      # pickup location -> row layout
+        self.paths = set()
+    
+    def write(self, record, location):
+        """Write a DoorDashRecord for a pickup location to its partition."""
+        key = (record.date_of_delivery if self.by_date else None, location if self.by_location else None)
+        partition = self.partitions.get(key)
+        if partition is None:
+            partition = self.partitions[key] = [self.start_shard(key, 1, location), 1]
+        elif self.max_rows and self.files[partition[0]][2] >= self.max_rows:
+            self.release(partition[0])
+            partition[1] += 1
+            partition[0] = self.start_shard(key, partition[1], location)
+        
+        index = partition[0]
+        handle = self.handles.get(index)
+        if handle is None:
+            handle = self.open(index)
+        else:
+            self.handles.move_to_end(index)
+        
+        layout = self.layouts.get(location)
+        if layout is None:
+            layout = self.layouts[location] = self.converter.row_layout(location)
+        handle[1](layout(record))
+        self.files[index][2] += 1
+    
+    def start_shard(self, key, number, location):
+        """Start a new shard file for a partition and return its index."""
+        parts = [self.base]
+        for value in key:
+            if value is not None:
+                parts.append(re.sub(r'[^\w.-]+', '-', value).strip('-') or 'none')
+        if self.max_rows:
+            parts.append(f"part{number:03d}")
+        path = '_'.join(parts) + '.csv'
+        
+        # Different keys can clean up to the same file name
+        candidate = path
+        suffix = 1
+        while candidate in self.paths:
+            suffix += 1
+            candidate = f"{os.path.splitext(path)[0]}-{suffix}.csv"
+        self.paths.add(candidate)
+        
+        self.files.append([candidate, temporary_path(candidate), 0, location])
+        return len(self.files) - 1
+    
+    def open(self, index):
+        """Open a shard file, closing the least recently used one if too many are open."""
+        if len(self.handles) >= self.max_open_files:
+            self.release(next(iter(self.handles)))
+        path, temp_file, rows, location = self.files[index]
+        f = open(temp_file, 'a' if rows else 'w', newline='', encoding='utf-8')
+        writer = csv.writer(f)
+        if not rows:
+            writer.writerow(self.converter.doordash_fields)
+        self.handles[index] = (f, writer.writerow)
+        return self.handles[index]
+    
+    def release(self, index):
+        """Close a shard file if it is open."""
+        handle = self.handles.pop(index, None)
+        if handle is not None:
+            handle[0].close()
+    
+    def close(self):
+        """Close all files, move them into place and return a list of (path, rows)."""
+        for index in list(self.handles):
+            self.release(index)
+        for path, temp_file, rows, location in self.files:
+            os.replace(temp_file, path)
+        return [(path, rows) for path, temp_file, rows, location in self.files]
+    
+    def abort(self):
+        """Close and remove all files written so far."""
+        for index in list(self.handles):
+            self.release(index)
+        for path, temp_file, rows, location in self.files:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+class GzipCsvWriter:
+    """Write DoorDash rows to a gzip-compressed CSV file."""
+    suffix = '.csv.gz'
+    
+    def __init__(self, file_path, fields):
+        import gzip
+        self.file = io.TextIOWrapper(io.BufferedWriter(gzip.GzipFile(file_path, 'wb', GZIP_COMPRESS_LEVEL),
+                                                       GZIP_BUFFER_BYTES), newline='', encoding='utf-8')
+        self.write = csv.writer(self.file).writerow
+        self.write(fields)
+    
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter:
+    """Write DoorDash rows to a JSON Lines file, one object per order keyed by DoorDash column."""
+    suffix = '.jsonl'
+    
+    def __init__(self, file_path, fields):
+        from json.encoder import encode_basestring
+        self.file = open(file_path, 'w', encoding='utf-8')
+        self.fields = fields
+        self.encode_string = encode_basestring
+        self.encode = json.JSONEncoder(ensure_ascii=False).encode
+        # Keys are encoded once; each row only encodes its values
+        self.keys = [encode_basestring(field) + ': ' for field in fields]
+    
+    def write(self, row):
+        encode_string = self.encode_string
+        try:
+            line = '{' + ', '.join([key + encode_string(value) for key, value in zip(self.keys, row)]) + '}\n'
+        except TypeError:
+            # Values that are not strings, e.g. numbers set on the converter
+            line = self.encode(dict(zip(self.fields, row))) + '\n'
+        self.file.write(line)
+    
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """
+    Write DoorDash rows to a Parquet file with one string column per DoorDash column.
+    Rows are buffered and written as a row group every PARQUET_ROW_GROUP_SIZE rows,
+    so memory stays bounded. Needs pyarrow.
+    """
+    suffix = '.parquet'
+    
+    def __init__(self, file_path, fields):
+        load_pyarrow()
+        self.schema = pa.schema([(field, pa.string()) for field in fields])
+        self.writer = pq.ParquetWriter(file_path, self.schema)
+        self.rows = []
+    
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= PARQUET_ROW_GROUP_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Write the buffered rows as one row group."""
+        if self.rows:
+            columns = [pa.array(column, pa.string()) for column in zip(*self.rows)]
+            self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+            self.rows = []
+    
+    def close(self):
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
+
+
+# Extra output formats written next to the DoorDash CSV. A writer is created as cls(file_path, fields),
+# receives each row as a tuple in DoorDash column order through write(row) and is finished by close().
+OUTPUT_FORMATS = {
+    'csv.gz': GzipCsvWriter,
+    'jsonl': JsonLinesWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class DoorDashSubmitter:
+    """
+    Send converted DoorDash orders to an HTTP endpoint.
+    Orders (DoorDash row dictionaries) are POSTed as JSON, {"orders": [row, ...]}, in batches of
+    batch_size over pooled keep-alive connections, with at most max_in_flight requests at once.
+    429 and 5xx responses and connection errors are retried with exponential backoff and jitter,
+    honoring Retry-After, up to max_retries times; other errors fail the batch. A 2xx response may
+    list {"order_id": ..., "error": ...} entries under "results" to reject single orders.
+    The outcome and a content hash of every order are appended to results_file. Orders that already
+    succeeded there with the same contents are skipped, so an interrupted or partly failed submission
+    can simply be run again, while orders changed since they were sent are sent again.
+    """
+    
+    def __init__(self, endpoint, results_file, token=None, batch_size=SUBMIT_BATCH_SIZE,
+                 max_in_flight=SUBMIT_MAX_IN_FLIGHT, max_retries=SUBMIT_MAX_RETRIES,
+                 backoff=SUBMIT_BACKOFF_SECONDS, max_backoff=SUBMIT_MAX_BACKOFF_SECONDS,
+                 timeout=SUBMIT_TIMEOUT_SECONDS, log=None):
+        from urllib.parse import urlsplit
+        url = urlsplit(endpoint)
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise ValueError(f"Invalid endpoint: {endpoint}")
+        self.endpoint = endpoint
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.path = (url.path or '/') + (f"?{url.query}" if url.query else '')
+        self.results_file = results_file
+        self.token = token
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.log = log or (lambda message: None)
+        self.connections = queue.LifoQueue()  # idle keep-alive connections
+        self.lock = threading.Lock()
+        self.retries = 0
+    
+    def load_results(self):
+        """Return the content hash each order in results_file last succeeded with."""
+        succeeded = {}
         try:
-            date_obj = datetime.strptime(date_str, "%m/%d/%Y")
-            return date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            return date_str
+            with open(self.results_file, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    if entry['status'] == 'succeeded':
+                        succeeded[entry['order_id']] = entry.get('hash')
+        except FileNotFoundError:
+            pass
+        return succeeded
     
-    def format_time(self, time_str):
-        """
-        Convert time from "HH:MM AM/PM" to 24-hour format "HH:MM:SS".
-        Example: "07:15 AM" -> "07:15:00"
-        """
-        if not time_str or time_str.strip() == "":
-            return ""
-            
+    def record(self, results):
+        """Append (order_id, status, error, content hash) results to results_file and flush them to disk."""
+        stamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+        lines = "".join(json.dumps({'order_id': order_id, 'status': status, 'error': error, 'hash': digest,
+                                    'time': stamp}) + "\n"
+                        for order_id, status, error, digest in results)
+        with self.lock:
+            with open(self.results_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def connection(self):
+        """Return (connection, reused), reusing an idle keep-alive connection if there is one."""
         try:
-            time_obj = datetime.strptime(time_str, "%I:%M %p")
-            return time_obj.strftime("%H:%M:%S")
-        except ValueError:
-            return time_str
+            return self.connections.get_nowait(), True
+        except queue.Empty:
+            import http.client
+            if self.scheme == 'https':
+                return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout), False
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
     
-    def process_dropoff_instructions(self, notes):
-        """
-        Process delivery notes to create appropriate dropoff instructions.
-        - Remove references to "Call CS for issues"
-        - Remove "Please deliver after X time"
-        - Add standard delivery instruction to every note
-        - If blank, use default instructions
-        """
-        if not notes or notes.strip() == "":
-            return self.default_dropoff_instructions
-            
-        # Remove quotes if present
-        notes = notes.strip('"')
-        
-        # Remove specific phrases
-        notes = re.sub(r"Call CS for (any )?issues\.?", "", notes, flags=re.IGNORECASE)
-        notes = re.sub(r"Please deliver after \d+(\:\d+)?( [AP]M)?\.?", "", notes, flags=re.IGNORECASE)
-        
-        # Clean up any double spaces or leading/trailing spaces
-        notes = re.sub(r"\s+", " ", notes).strip()
-        
-        # If notes are now empty, use default
-        if not notes:
-            notes = self.default_dropoff_instructions
-            
-        # Add standard delivery instruction to every note
-        standard_note = "Please deliver directly to the client. Do not leave unattended unless client has provided a cooler."
+    def post(self, body, headers):
+        """POST body on a pooled connection and return (status, Retry-After header, response body)."""
+        import http.client
+        while True:
+            connection, reused = self.connection()
+            try:
+                connection.request('POST', self.path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if reused:
+                    # The server closed the idle connection; try again on a new one
+                    continue
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self.connections.put(connection)
+            return response.status, response.getheader('Retry-After'), data
+    
+    def send_batch(self, orders):
+        """Send one batch with retries, record and return its (order_id, status, error, content hash) results."""
+        import http.client
+        order_ids = [order['Order ID*'] for order in orders]
+        body = json.dumps({'orders': orders}).encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json',
+            # A corrected batch is a new request, not a replay of the earlier one
+            'Idempotency-Key': hashlib.sha256(body).hexdigest(),
+        }
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
         
-        # Check if the standard note is already included in the instructions
-        if standard_note.lower() not in notes.lower():
-            # Combine notes with standard instruction
-            combined_notes = f"{notes} {standard_note}"
-            
-            # Ensure notes don't exceed 250 characters
-            if len(combined_notes) > 250:
-                # If too long, prioritize the standard note and truncate the original notes
-                max_original_length = 250 - len(standard_note) - 4  # 4 chars for " ..."
-                notes = f"{notes[:max_original_length]}... {standard_note}"
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                status, retry_after, data = self.post(body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                error = f"Connection error: {str(e) or type(e).__name__}"
             else:
-                notes = combined_notes
+                if 200 <= status < 300:
+                    results = self.batch_results(order_ids, data)
+                    break
+                error = f"HTTP {status}: {data[:200].decode('utf-8', 'replace').strip()}"
+                if status != 429 and status < 500:
+                    results = [(order_id, 'failed', error) for order_id in order_ids]
+                    break
+            
+            attempt += 1
+            if attempt > self.max_retries:
+                results = [(order_id, 'failed', error) for order_id in order_ids]
+                break
+            with self.lock:
+                self.retries += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            try:
+                delay = max(delay, min(self.max_backoff, float(retry_after)))
+            except (TypeError, ValueError):
+                pass
+            time.sleep(delay)
         
-        return notes
+        results = [result + (order_digest(order),) for result, order in zip(results, orders)]
+        self.record(results)
+        return results
     
-    def count_meal_items(self, row):
+    @staticmethod
+    def batch_results(order_ids, data):
+        """Return per-order results of an accepted batch, applying any per-order errors in the response."""
+        errors = {}
+        try:
+            for entry in json.loads(data).get('results', []):
+                if entry.get('error'):
+                    errors[str(entry.get('order_id'))] = str(entry['error'])
+        except (ValueError, AttributeError, TypeError):
+            pass
+        return [(order_id, 'failed', errors[order_id]) if order_id in errors else (order_id, 'succeeded', None)
+                for order_id in order_ids]
+    
+    def submit(self, orders):
         """
-        Count the number of meal items for a client.
-        Meal items in WorkWave start with 'lb|'.
+        Submit DoorDash row dictionaries, skipping orders that already succeeded with the same contents.
+        Returns a summary with the keys submitted, succeeded, failed, skipped, retries and duration.
         """
-        meal_count = 0
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        start = time.perf_counter()
+        done = self.load_results()
+        summary = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'skipped': 0, 'retries': 0}
         
-        # Iterate through all columns in the row
-        for key, value in row.items():
-            # Check if the column name starts with 'lb|' and has a non-empty value
-            if key.startswith('lb|') and value and value.strip():
-                try:
-                    # Try to convert the value to an integer
-                    item_count = int(value.strip())
-                    meal_count += item_count
-                except ValueError:
-                    # If the value is not a number but not empty, count it as 1
-                    if value.strip() != "":
-                        meal_count += 1
+        pending = []
+        seen = set()
+        invalid = []
+        for order in orders:
+            order_id = order.get('Order ID*', '')
+            if order_id and order_id not in seen and done.get(order_id) == order_digest(order):
+                seen.add(order_id)
+                summary['skipped'] += 1
+            elif not order_id or order_id in seen:
+                invalid.append((order_id, 'failed', "Duplicate Order ID" if order_id else "Missing Order ID",
+                                order_digest(order)))
+            else:
+                seen.add(order_id)
+                pending.append(order)
+        if invalid:
+            self.record(invalid)
+            summary['failed'] += len(invalid)
         
-        # If no meals were found, default to 1 as mentioned in the transcript
-        return max(1, meal_count)
+        retries = self.retries
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+                futures = [executor.submit(self.send_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    for order_id, status, error, digest in future.result():
+                        summary['submitted'] += 1
+                        summary[status] += 1
+                        if error:
+                            self.log(f"FAILED {order_id}: {error}")
+        finally:
+            while not self.connections.empty():
+                self.connections.get_nowait().close()
+        summary['retries'] = self.retries - retries
+        summary['duration'] = time.perf_counter() - start
+        return summary
+
+
+def order_digest(order):
+    """Return a content hash of a DoorDash row dictionary."""
+    return hashlib.blake2b(json.dumps(order, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def inotify_watch(directory):
+    """Return a non-blocking inotify file descriptor watching directory for new and written files."""
+    import ctypes
+    libc = ctypes.CDLL(None, use_errno=True)
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    if libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_MASK) < 0:
+        error = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(error, f"Cannot watch {directory}")
+    return fd
+
+
+class DirectoryWatch:
+    """
+    Wait for changes in a directory, using inotify on Linux and polling elsewhere.
+    wait() only says whether something may have changed; callers rescan the directory.
+    """
     
-    def convert_workwave_to_doordash(self, workwave_data):
-        """
-        Convert WorkWave data to DoorDash format.
-        """
-        doordash_data = []
-        
-        for row in workwave_data:
-            # Skip header row or empty rows
-            if row.get(self.workwave_fields['address']) == 'Address' or not row.get(self.workwave_fields['address']):
+    def __init__(self, directory, polling=False):
+        self.fd = None
+        if not polling and sys.platform.startswith('linux'):
+            try:
+                self.fd = inotify_watch(directory)
+            except (OSError, AttributeError):
+                # No inotify, e.g. a network share or a sandbox; fall back to polling
+                self.fd = None
+    
+    @property
+    def mode(self):
+        return 'polling' if self.fd is None else 'inotify'
+    
+    def wait(self, timeout):
+        """Wait up to timeout seconds; return True if the directory may have changed."""
+        if self.fd is None:
+            time.sleep(timeout)
+            return True
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+    
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class FolderWatcher:
+    """
+    Convert WorkWave exports as they land in a folder.
+    Files matching pattern in input_dir are converted into output_dir once they have stayed
+    unchanged for settle_seconds, so partially written files are left alone. Conversions run
+    in a pool of at most workers processes. Every processed file is appended to a ledger in
+    output_dir with its size and modification time, so each version of a file is converted
+    once, also across restarts; a file that is exported again is converted again.
+    Outputs are written atomically by convert_file, so a file interrupted by a crash is
+    simply converted again on the next start.
+    """
+    
+    def __init__(self, converter, input_dir, output_dir=None, pattern='*.csv', workers=None,
+                 settle_seconds=WATCH_SETTLE_SECONDS, poll_interval=WATCH_POLL_INTERVAL, polling=False,
+                 streaming=True, engine='python', log=None):
+        self.converter = converter
+        self.input_dir = input_dir
+        self.output_dir = output_dir or os.path.join(input_dir, 'doordash')
+        self.pattern = pattern
+        self.workers = workers or os.cpu_count() or 1
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.polling = polling
+        self.streaming = streaming
+        self.engine = engine
+        self.log = log or (lambda message: None)
+        self.ledger_file = os.path.join(self.output_dir, WATCH_LEDGER_NAME)
+        self.processed = {}  # file name -> [size, mtime_ns] of the last processed version
+        self.pending = {}    # file name -> [[size, mtime_ns], monotonic time it was first seen so]
+        self.running = {}    # future -> (file name, [size, mtime_ns])
+        self.attempts = collections.Counter()
+        self.executor = None
+    
+    def load_ledger(self):
+        """Load the versions of the files processed by earlier runs."""
+        self.processed = {}
+        try:
+            with open(self.ledger_file, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    self.processed[entry['name']] = entry['signature']
+        except FileNotFoundError:
+            pass
+    
+    def record(self, name, signature, summary):
+        """Append a processed file to the ledger and flush it to disk."""
+        entry = dict(summary, name=name, signature=signature, time=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        with open(self.ledger_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.processed[name] = signature
+    
+    def scan(self):
+        """Rescan input_dir and return the names of files ready to convert, oldest first."""
+        now = time.monotonic()
+        running = {name for name, signature in self.running.values()}
+        seen = set()
+        ready = []
+        for entry in os.scandir(self.input_dir):
+            name = entry.name
+            if name.startswith('.') or name.endswith('_doordash.csv') or not fnmatch.fnmatch(name, self.pattern):
                 continue
-                
-            # Skip departure rows
-            if row.get('Type', '').lower() == 'departure':
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            seen.add(name)
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if name in running or self.processed.get(name) == signature:
                 continue
-                
-            # Parse address
-            address = row.get(self.workwave_fields['address'], '')
-            street, city, state, zip_code = self.parse_address(address)
-            
-            # Parse name
-            name = row.get(self.workwave_fields['name'], '')
-            first_name, last_initial = self.parse_name(name)
-            
-            # Get unit/apartment info
-            unit = row.get(self.workwave_fields['unit'], '') or row.get(self.workwave_fields['unit_info'], '')
             
-            # Format date
-            date_str = row.get(self.workwave_fields['date'], '')
-            formatted_date = self.format_date(date_str)
+            # Debounce: wait until the file has stopped changing
+            state = self.pending.get(name)
+            if state is None or state[0] != signature:
+                self.pending[name] = state = [signature, now]
+            if stat.st_size and now - state[1] >= self.settle_seconds:
+                ready.append((state[1], name))
+        
+        for name in list(self.pending):
+            if name not in seen:
+                del self.pending[name]
+        return [name for first_seen, name in sorted(ready)]
+    
+    def submit(self, names):
+        """Start converting ready files while fewer than workers conversions are running."""
+        from concurrent.futures import ProcessPoolExecutor
+        for name in names:
+            if len(self.running) >= self.workers:
+                break
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            input_file = os.path.join(self.input_dir, name)
+            output_file = os.path.join(self.output_dir, os.path.basename(default_output_path(name)))
+            future = self.executor.submit(convert_batch_item, self.converter, input_file, output_file,
+                                          self.streaming, self.engine)
+            self.running[future] = (name, self.pending.pop(name)[0])
+    
+    def collect(self):
+        """Record finished conversions in the ledger and return their summaries."""
+        from concurrent.futures.process import BrokenProcessPool
+        summaries = []
+        for future in [future for future in self.running if future.done()]:
+            name, signature = self.running.pop(future)
+            try:
+                summary = future.result()
+            except BaseException as e:
+                # The worker process died or was interrupted, not the conversion itself
+                if isinstance(e, BrokenProcessPool):
+                    self.executor = None
+                self.attempts[name] += 1
+                summary = batch_summary(os.path.join(self.input_dir, name), None,
+                                        error=str(e) or type(e).__name__)
+                if self.attempts[name] < WATCH_MAX_ATTEMPTS:
+                    # Not recorded, so the file is tried again
+                    self.log(format_batch_summary(summary) + " (will retry)")
+                    continue
+            self.attempts.pop(name, None)
+            self.record(name, signature, summary)
+            self.log(format_batch_summary(summary))
+            summaries.append(summary)
+        return summaries
+    
+    def run(self, stop_event=None):
+        """Watch input_dir until stop_event is set or the process is interrupted."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.load_ledger()
+        watch = DirectoryWatch(self.input_dir, self.polling)
+        self.log(f"Watching {self.input_dir} ({watch.mode}), writing to {self.output_dir}")
+        changed = True
+        last_scan = 0.0
+        try:
+            while stop_event is None or not stop_event.is_set():
+                # With inotify, only rescan on events, while files are settling, or now and then
+                if changed or self.pending or time.monotonic() - last_scan >= 30 * self.poll_interval:
+                    last_scan = time.monotonic()
+                    self.submit(self.scan())
+                self.collect()
+                
+                timeout = self.poll_interval
+                if self.pending:
+                    timeout = min(timeout, self.settle_seconds / 4)
+                if self.running:
+                    timeout = min(timeout, 0.1)
+                changed = watch.wait(timeout)
+        finally:
+            watch.close()
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.collect()
+                self.executor = None
+
+
+class IncompleteRecord(Exception):
+    """Raised by LineQueue when the CSV reader needs lines that have not arrived yet."""
+
+
+class LineQueue:
+    """
+    Lines fed to a csv.reader as they arrive. The lines taken for the current record
+    are kept so they can be put back if the record turns out to be incomplete.
+    """
+    
+    def __init__(self):
+        self.lines = collections.deque()
+        self.taken = []
+        self.final = False
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self.lines:
+            line = self.lines.popleft()
+            self.taken.append(line)
+            return line
+        if self.final:
+            raise StopIteration
+        raise IncompleteRecord()
+    
+    def restore(self):
+        """Put back the lines of an incomplete record."""
+        self.lines.extendleft(reversed(self.taken))
+        self.taken = []
+
+
+class StreamConverter:
+    """
+    Convert WorkWave CSV data pushed in pieces, e.g. while it is being uploaded.
+    feed() takes bytes as they arrive and returns the DoorDash CSV bytes ready so far,
+    close() returns the rest. The output is the same as convert_file's.
+    """
+    
+    def __init__(self, converter):
+        self.converter = converter
+        # Decode and translate newlines the same way reading the file in text mode does
+        self.decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8-sig')(), translate=True)
+        self.lines = LineQueue()
+        self.reader = csv.reader(self.lines)
+        self.tail = ''
+        self.in_quotes = False
+        self.plan = None
+        self.output = io.StringIO()
+        self.writer = csv.writer(self.output)
+        self.writer.writerow(converter.doordash_fields)
+        self.layout = converter.row_layout()
+        self.rows_in = 0
+        self.rows_out = 0
+    
+    def feed(self, data):
+        """Convert the complete records in data and return the output produced so far."""
+        self.queue_text(self.decoder.decode(data))
+        # Only parse when the queued lines end outside a quoted field
+        if not self.in_quotes:
+            self.convert_queued()
+        return self.take_output()
+    
+    def close(self):
+        """Convert the remaining data and return the rest of the output."""
+        self.queue_text(self.decoder.decode(b'', final=True))
+        if self.tail:
+            self.lines.lines.append(self.tail)
+            self.tail = ''
+        self.lines.final = True
+        self.convert_queued()
+        return self.take_output()
+    
+    def queue_text(self, text):
+        """Queue the complete lines of text, keeping a trailing partial line for later."""
+        lines = (self.tail + text).split('\n')
+        self.tail = lines.pop()
+        for line in lines:
+            self.lines.lines.append(line + '\n')
+            if line.count('"') % 2:
+                self.in_quotes = not self.in_quotes
+    
+    def convert_queued(self):
+        """Convert every complete record in the queue."""
+        convert_record = self.converter.convert_record
+        writerow = self.writer.writerow
+        while True:
+            self.lines.taken = []
+            try:
+                record = next(self.reader)
+            except StopIteration:
+                return
+            except IncompleteRecord:
+                self.lines.restore()
+                return
             
-            # Process notes/instructions
-            notes = row.get(self.workwave_fields['notes'], '')
-            dropoff_instructions = self.process_dropoff_instructions(notes)
+            # The first record is the header, as in open_workwave_records
+            if self.plan is None:
+                self.plan = self.converter.build_conversion_plan(record)
+                continue
+            if not record:
+                continue
+            self.rows_in += 1
+            doordash_row = convert_record(self.plan, record)
+            if doordash_row is not None:
+                writerow(self.layout(doordash_row))
+                self.rows_out += 1
+    
+    def take_output(self):
+        """Return and clear the output written so far."""
+        data = self.output.getvalue()
+        self.output.seek(0)
+        self.output.truncate()
+        return data.encode('utf-8')
+
+
+class ConversionService:
+    """
+    Small asyncio HTTP service around the converter for tools on the same machine.
+    POST /convert with a WorkWave CSV body (Content-Length or chunked) streams the DoorDash CSV
+    back while the upload is still being read. Settings are taken from query parameters named
+    like the converter attributes, plus map_field=FIELD=COLUMN and remove_note_pattern=REGEX, e.g.
+    /convert?pickup_location_id=ANGEL-2&timezone=US/Pacific. At most max_concurrent conversions run
+    at once; further requests get 503. GET /health returns status and counters as JSON.
+    """
+    
+    def __init__(self, converter=None, host='127.0.0.1', port=DEFAULT_SERVICE_PORT,
+                 max_concurrent=DEFAULT_SERVICE_CONCURRENCY, log=None):
+        self.converter = converter or WorkWaveToDoorDashConverter()
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.log = log or (lambda message: None)
+        self.active = 0
+        self.metrics = collections.Counter()
+        self.started = time.time()
+        self.server = None
+    
+    async def start(self):
+        """Start listening; with port 0 a free port is picked and stored in self.port."""
+        import asyncio
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.log(f"Serving on http://{self.host}:{self.port} (POST /convert, GET /health)")
+        return self.server
+    
+    async def serve_forever(self):
+        """Start the service and run until cancelled."""
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+    
+    def health(self):
+        """Return the status and counters reported by /health."""
+        return {
+            'status': 'ok',
+            'active': self.active,
+            'max_concurrent': self.max_concurrent,
+            'uptime_seconds': round(time.time() - self.started, 3),
+            **{key: self.metrics[key] for key in ('requests', 'rejected', 'errors', 'rows_in', 'rows_out',
+                                                   'bytes_in', 'bytes_out')},
+        }
+    
+    def request_converter(self, query):
+        """Return a copy of the converter with the settings from a query string applied."""
+        from urllib.parse import parse_qs
+        converter = copy.copy(self.converter)
+        converter.workwave_fields = dict(converter.workwave_fields)
+        converter.dropoff_removal_rules = list(converter.dropoff_removal_rules)
+        converter.cache = None
+        converter.instrumentation = None
+        settings = {attribute for flag, attribute, help_text in CLI_SETTINGS}
+        for name, values in parse_qs(query, keep_blank_values=True).items():
+            if name in settings:
+                setattr(converter, name, values[-1])
+            elif name == 'map_field':
+                apply_field_mappings(converter, values)
+            elif name == 'remove_note_pattern':
+                converter.dropoff_removal_rules.extend(values)
+            else:
+                raise ValueError(f"Unknown parameter: {name}")
+        # Reject invalid note patterns before anything is streamed
+        converter.compiled_dropoff_rules()
+        return converter
+    
+    async def handle(self, reader, writer):
+        """Serve one HTTP request and close the connection."""
+        import asyncio
+        try:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = request_line.split(' ', 2)
+            except ValueError:
+                await self.respond(writer, 400, "Bad request\n")
+                return
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
             
-            # Get phone number
-            phone = row.get(self.workwave_fields['phone'], '')
-            
-            # Get order number
-            order_id = row.get(self.workwave_fields['order_number'], '')
-            
-            # Count meal items
-            num_items = str(self.count_meal_items(row))
-            
-            # Create DoorDash row
-            doordash_row = {
-                'Pickup Location ID*': self.pickup_location_id,
-                'Order ID*': order_id,
-                'Date of Delivery*': formatted_date,
-                'Pickup Window Start*': self.pickup_window_start,
-                'Pickup Window End*': self.pickup_window_end,
-                'Timezone*': self.timezone,
-                'Client First Name*': first_name,
-                'Client Last Name*': last_initial,
-                'Client Street Address*': street,
-                'Client Unit': unit,
-                'Client City*': city,
-                'Client State*': state,
-                'Client ZIP*': zip_code,
-                'Client Phone*': phone,
-                'Number of Items*': num_items,
-                'Dropoff Instructions (250 character max)': dropoff_instructions,
-                'Pickup Location Name': self.pickup_location_name,
-                'Pickup Phone Number': self.pickup_phone_number,
-                'Pickup Instructions': self.pickup_instructions,
-                'Order Volume': ''
-            }
-            
-            doordash_data.append(doordash_row)
-            
-        return doordash_data
+            path, _, query = target.partition('?')
+            if path not in ('/convert', '/health'):
+                await self.respond(writer, 404, "Not found\n")
+            elif (path == '/convert') != (method == 'POST') or method not in ('GET', 'POST'):
+                await self.respond(writer, 405, "Method not allowed\n")
+            elif path == '/health':
+                await self.respond(writer, 200, json.dumps(self.health()) + "\n", 'application/json')
+            else:
+                await self.convert(reader, writer, headers, query)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The client went away
+            pass
+        finally:
+            await self.linger(reader, writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
     
-    def read_workwave_csv(self, file_path):
+    async def linger(self, reader, writer):
         """
-        Read WorkWave CSV file and return data as a list of dictionaries.
+        Half-close the connection and discard unread request data for a moment, so a response
+        sent before the upload was read (e.g. 503) is not lost to a connection reset.
         """
+        import asyncio
         try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                return list(reader)
-        except Exception as e:
-            raise Exception(f"Error reading WorkWave CSV file: {str(e)}")
+            if writer.can_write_eof():
+                writer.write_eof()
+            
+            async def discard():
+                while await reader.read(SERVICE_READ_SIZE):
+                    pass
+            await asyncio.wait_for(discard(), SERVICE_LINGER_SECONDS)
+        except (ConnectionError, asyncio.TimeoutError, OSError):
+            pass
     
-    def write_doordash_csv(self, data, file_path):
-        """
-        Write DoorDash data to CSV file.
-        """
+    async def respond(self, writer, status, body, content_type='text/plain; charset=utf-8', headers=None):
+        """Send a complete response."""
+        from http import HTTPStatus
+        body = body.encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Type: {content_type}",
+                 f"Content-Length: {len(body)}", "Connection: close"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+    
+    async def read_body(self, reader, headers):
+        """Yield the request body in pieces as it arrives."""
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while (await reader.readline()).strip():
+                        pass
+                    return
+                while size:
+                    data = await reader.read(min(size, SERVICE_READ_SIZE))
+                    if not data:
+                        raise ConnectionError("Upload ended early")
+                    size -= len(data)
+                    yield data
+                await reader.readexactly(2)
+        else:
+            remaining = int(headers.get('content-length', 0))
+            while remaining:
+                data = await reader.read(min(remaining, SERVICE_READ_SIZE))
+                if not data:
+                    raise ConnectionError("Upload ended early")
+                remaining -= len(data)
+                yield data
+    
+    async def convert(self, reader, writer, headers, query):
+        """Stream a WorkWave CSV upload through a StreamConverter into a chunked DoorDash CSV response."""
+        if self.active >= self.max_concurrent:
+            self.metrics['rejected'] += 1
+            await self.respond(writer, 503, "Too many conversions in progress\n", headers={'Retry-After': '1'})
+            return
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.doordash_fields)
-                writer.writeheader()
-                writer.writerows(data)
+            stream = StreamConverter(self.request_converter(query))
         except Exception as e:
-            raise Exception(f"Error writing DoorDash CSV file: {str(e)}")
-    
-    def convert_file(self, input_file, output_file):
-        """
-        Convert WorkWave CSV file to DoorDash CSV file.
-        """
+            await self.respond(writer, 400, f"Invalid settings: {str(e)}\n")
+            return
+        length = headers.get('content-length', '0')
+        if headers.get('transfer-encoding', '').lower() != 'chunked' and not (length.isascii() and length.isdigit()):
+            await self.respond(writer, 400, "Invalid Content-Length\n")
+            return
+        
+        self.active += 1
+        self.metrics['requests'] += 1
+        started = False
         try:
-            # Read WorkWave data
-            workwave_data = self.read_workwave_csv(input_file)
-            
-            # Convert to DoorDash format
-            doordash_data = self.convert_workwave_to_doordash(workwave_data)
+            if headers.get('expect', '').lower() == '100-continue':
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
             
-            # Write DoorDash data
-            self.write_doordash_csv(doordash_data, output_file)
+            async def send(output):
+                nonlocal started
+                if not started:
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/csv; charset=utf-8\r\n"
+                                 b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+                    started = True
+                if output:
+                    writer.write(b"%x\r\n%s\r\n" % (len(output), output))
+                    self.metrics['bytes_out'] += len(output)
+                await writer.drain()
             
-            return len(doordash_data)
+            async for data in self.read_body(reader, headers):
+                self.metrics['bytes_in'] += len(data)
+                output = stream.feed(data)
+                if output:
+                    await send(output)
+            await send(stream.close())
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            self.metrics['rows_in'] += stream.rows_in
+            self.metrics['rows_out'] += stream.rows_out
         except Exception as e:
-            raise Exception(f"Conversion error: {str(e)}")
+            self.metrics['errors'] += 1
+            if not started:
+                await self.respond(writer, 400, f"Conversion error: {str(e)}\n")
+            # Otherwise the connection is closed without the final chunk, so the client sees a cut-off response
+            self.log(f"Conversion error: {str(e)}")
+        finally:
+            self.active -= 1
 
 
 class ConverterGUI:
@@ -316,13 +3053,20 @@ class ConverterGUI:
     """
     
     def __init__(self, root):
+        load_tkinter()
         self.root = root
         self.root.title("WorkWave to DoorDash Converter")
-        self.root.geometry("700x600")
+        self.root.geometry("700x650")
         self.root.resizable(True, True)
         
         self.converter = WorkWaveToDoorDashConverter()
         
+        # Background conversion state; the worker thread only talks to the GUI through the queue
+        self.events = queue.Queue()
+        self.cancel_event = None
+        self.worker = None
+        self.stage = None
+        
         self.create_widgets()
         
     def create_widgets(self):
@@ -405,6 +3149,17 @@ class ConverterGUI:
         self.default_dropoff_var = tk.StringVar(value=self.converter.default_dropoff_instructions)
         ttk.Entry(dropoff_frame, textvariable=self.default_dropoff_var, width=60).pack(side=tk.LEFT, padx=5, pady=2, fill=tk.X, expand=True)
         
+        # Persistent client/address cache
+        self.use_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text=f"Remember parsed clients between runs ({DEFAULT_CACHE_PATH})",
+                        variable=self.use_cache_var).pack(anchor=tk.W, padx=5, pady=2)
+        
+        # Pre-flight validation
+        self.validate_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Leave out rows missing required DoorDash fields and save them "
+                                             "to <output>_rejects.csv",
+                        variable=self.validate_var).pack(anchor=tk.W, padx=5, pady=2)
+        
         # Conversion button
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(pady=10)
@@ -412,6 +3167,18 @@ class ConverterGUI:
         self.convert_button = ttk.Button(button_frame, text="Convert", command=self.convert)
         self.convert_button.pack(side=tk.LEFT, padx=5)
         
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
+        # Progress bar and current stage
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.pack(fill=tk.X, pady=5)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, mode='determinate')
+        self.progress_bar.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        self.progress_var = tk.StringVar(value="")
+        ttk.Label(progress_frame, textvariable=self.progress_var, width=30).pack(side=tk.LEFT, padx=5)
+        
         # Status frame
         status_frame = ttk.LabelFrame(main_frame, text="Status", padding="10")
         status_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -432,12 +3199,12 @@ class ConverterGUI:
         """Open file dialog to select input file."""
         file_path = filedialog.askopenfilename(
             title="Select WorkWave CSV File",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+            filetypes=[("CSV Files", "*.csv *.csv.gz *.zip"), ("All Files", "*.*")]
         )
         if file_path:
             self.input_path_var.set(file_path)
             # Auto-generate output file path
-            output_path = os.path.splitext(file_path)[0] + "_doordash.csv"
+            output_path = default_output_path(file_path)
             self.output_path_var.set(output_path)
             self.log(f"Selected input file: {file_path}")
     
@@ -467,9 +3234,16 @@ class ConverterGUI:
         self.converter.pickup_window_end = self.pickup_end_var.get()
         self.converter.timezone = self.timezone_var.get()
         self.converter.default_dropoff_instructions = self.default_dropoff_var.get()
+        
+        # Open or close the persistent cache
+        if self.use_cache_var.get() and self.converter.cache is None:
+            self.converter.cache = ParseCache(DEFAULT_CACHE_PATH)
+        elif not self.use_cache_var.get() and self.converter.cache is not None:
+            self.converter.cache.close()
+            self.converter.cache = None
     
     def convert(self):
-        """Convert WorkWave CSV to DoorDash CSV."""
+        """Start converting WorkWave CSV to DoorDash CSV in a background thread."""
         input_file = self.input_path_var.get()
         output_file = self.output_path_var.get()
         
@@ -481,34 +3255,499 @@ class ConverterGUI:
             messagebox.showerror("Error", "Please select an output file.")
             return
         
+        if self.worker is not None and self.worker.is_alive():
+            return
+        
+        self.log("Starting conversion...")
+        self.convert_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_bar.config(value=0, maximum=1)
+        self.progress_var.set("")
+        self.stage = None
+        
+        # Update converter settings
         try:
-            self.log("Starting conversion...")
-            self.convert_button.config(state=tk.DISABLED)
-            self.root.update()
-            
-            # Update converter settings
             self.update_converter_settings()
-            
-            # Perform conversion
-            count = self.converter.convert_file(input_file, output_file)
-            
-            self.log(f"Conversion complete! {count} orders processed.")
-            self.log(f"Output saved to: {output_file}")
-            
-            messagebox.showinfo("Success", f"Conversion complete! {count} orders processed.")
         except Exception as e:
             self.log(f"Error: {str(e)}")
             messagebox.showerror("Error", str(e))
-        finally:
             self.convert_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+            return
+        
+        # Perform conversion without blocking the Tk main loop
+        rejects_file = rejects_path(output_file) if self.validate_var.get() else None
+        self.cancel_event = threading.Event()
+        self.worker = threading.Thread(target=self.run_conversion,
+                                       args=(input_file, output_file, self.cancel_event, rejects_file), daemon=True)
+        self.worker.start()
+        self.root.after(GUI_POLL_INTERVAL_MS, self.poll_events)
+    
+    def run_conversion(self, input_file, output_file, cancel_event, rejects_file=None):
+        """Run a conversion on the worker thread, reporting back through the event queue."""
+        def progress(rows_done, rows_total, stage):
+            self.events.put(('progress', rows_done, rows_total, stage))
+        
+        try:
+            summary = {}
+            count = self.converter.convert_file(input_file, output_file, streaming=True, summary=summary,
+                                                progress=progress, cancel_event=cancel_event,
+                                                rejects_file=rejects_file)
+            self.events.put(('done', count, output_file, summary, rejects_file))
+        except ConversionCancelled:
+            self.events.put(('cancelled',))
+        except Exception as e:
+            self.events.put(('error', str(e)))
+    
+    def poll_events(self):
+        """Apply events from the worker thread to the GUI; runs on the Tk main thread."""
+        finished = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            
+            kind = event[0]
+            if kind == 'progress':
+                rows_done, rows_total, stage = event[1:]
+                if stage != self.stage:
+                    self.stage = stage
+                    if stage != 'done':
+                        self.log(f"{stage.capitalize()}...")
+                self.progress_bar.config(maximum=max(rows_total, 1), value=rows_done)
+                self.progress_var.set(f"{stage}: {rows_done} / {rows_total} rows")
+            elif kind == 'done':
+                count, output_file, summary, rejects_file = event[1:]
+                finished = True
+                message = f"Conversion complete! {count} orders processed."
+                self.log(message)
+                self.log(f"Output saved to: {output_file}")
+                if rejects_file is not None:
+                    self.log(format_reject_summary(summary, rejects_file))
+                    if summary.get('rows_rejected'):
+                        message += f"\n{summary['rows_rejected']} rows rejected, see {rejects_file}"
+                if 'cache_hits' in summary:
+                    self.log(f"Cache: {summary['cache_hits']} hits, {summary['cache_misses']} misses.")
+                messagebox.showinfo("Success", message)
+            elif kind == 'cancelled':
+                finished = True
+                self.progress_var.set("cancelled")
+                self.log("Conversion cancelled. No output file was written.")
+            elif kind == 'error':
+                finished = True
+                self.log(f"Error: {event[1]}")
+                messagebox.showerror("Error", event[1])
+        
+        if finished:
+            self.convert_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+        else:
+            self.root.after(GUI_POLL_INTERVAL_MS, self.poll_events)
+    
+    def cancel(self):
+        """Ask the running conversion to stop."""
+        if self.cancel_event is not None and not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.log("Cancelling...")
 
 
-def main():
-    """Main function to run the application."""
+# Command line flags for each converter setting: (flag, attribute, help)
+CLI_SETTINGS = [
+    ('--pickup-id', 'pickup_location_id', "Pickup Location ID"),
+    ('--pickup-name', 'pickup_location_name', "Pickup Location Name"),
+    ('--pickup-phone', 'pickup_phone_number', "Pickup Phone Number"),
+    ('--pickup-instructions', 'pickup_instructions', "Pickup Instructions"),
+    ('--pickup-window-start', 'pickup_window_start', "Pickup Window Start (HH:MM:SS)"),
+    ('--pickup-window-end', 'pickup_window_end', "Pickup Window End (HH:MM:SS)"),
+    ('--timezone', 'timezone', "Timezone, e.g. US/Pacific"),
+    ('--default-dropoff-instructions', 'default_dropoff_instructions', "Dropoff instructions used when notes are blank"),
+]
+
+
+def default_output_path(input_file):
+    """Return the default DoorDash output path for a WorkWave input file, e.g. routes.csv.gz -> routes_doordash.csv."""
+    if input_file.lower().endswith(COMPRESSED_SUFFIXES):
+        input_file = os.path.splitext(input_file)[0]
+    return os.path.splitext(input_file)[0] + "_doordash.csv"
+
+
+def add_converter_arguments(parser):
+    """Add a flag for every converter setting to an argument parser."""
+    defaults = WorkWaveToDoorDashConverter()
+    group = parser.add_argument_group("converter settings")
+    for flag, attribute, help_text in CLI_SETTINGS:
+        group.add_argument(flag, dest=attribute, default=None,
+                           help=f"{help_text} (default: {getattr(defaults, attribute)!r})")
+    group.add_argument('--map-field', dest='field_mappings', action='append', default=[], metavar='FIELD=COLUMN',
+                       help="Read a field from a different WorkWave column, e.g. name='Client Name'. "
+                            f"Fields: {', '.join(defaults.workwave_fields)}")
+    group.add_argument('--remove-note-pattern', dest='dropoff_removal_rules', action='append', default=[],
+                       metavar='REGEX',
+                       help="Also remove phrases matching this case-insensitive regex from dropoff notes")
+    group.add_argument('--cache', dest='cache_path', nargs='?', const=DEFAULT_CACHE_PATH, default=None,
+                       metavar='PATH',
+                       help=f"Reuse parsed addresses, names and notes from earlier runs (default path: {DEFAULT_CACHE_PATH})")
+    group.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_ENTRIES,
+                       help=f"Maximum cache entries per kind (default: {DEFAULT_CACHE_ENTRIES})")
+    group.add_argument('--engine', choices=ENGINES, default='python', help="Conversion engine (default: python)")
+    group.add_argument('--no-streaming', dest='streaming', action='store_false',
+                       help="Read the whole file before converting instead of streaming rows")
+
+
+def apply_field_mappings(converter, mappings):
+    """Apply FIELD=COLUMN mappings to a converter's WorkWave fields."""
+    for mapping in mappings:
+        field, sep, column = mapping.partition('=')
+        if not sep or field not in converter.workwave_fields:
+            raise ValueError(f"Invalid field mapping: {mapping}")
+        converter.workwave_fields[field] = column
+
+
+def converter_from_args(args):
+    """Create a converter configured from parsed command line arguments."""
+    converter = WorkWaveToDoorDashConverter()
+    for flag, attribute, help_text in CLI_SETTINGS:
+        value = getattr(args, attribute)
+        if value is not None:
+            setattr(converter, attribute, value)
+    apply_field_mappings(converter, args.field_mappings)
+    converter.dropoff_removal_rules.extend(args.dropoff_removal_rules)
+    if args.cache_path:
+        converter.cache = ParseCache(args.cache_path, args.cache_size)
+    return converter
+
+
+def add_submit_arguments(parser):
+    """Add the DoorDash submission options to an argument parser."""
+    group = parser.add_argument_group("submission")
+    group.add_argument('--token', default=os.environ.get('DOORDASH_API_TOKEN'),
+                       help="Bearer token for the endpoint (default: $DOORDASH_API_TOKEN)")
+    group.add_argument('--results', dest='results_file', metavar='PATH',
+                       help="Per-order results; orders that succeeded there are skipped "
+                            "(default: <DoorDash CSV>.submitted.jsonl)")
+    group.add_argument('--batch-size', type=int, default=SUBMIT_BATCH_SIZE,
+                       help=f"Orders per request (default: {SUBMIT_BATCH_SIZE})")
+    group.add_argument('--max-in-flight', type=int, default=SUBMIT_MAX_IN_FLIGHT,
+                       help=f"Requests sent at once (default: {SUBMIT_MAX_IN_FLIGHT})")
+    group.add_argument('--max-retries', type=int, default=SUBMIT_MAX_RETRIES,
+                       help=f"Retries of a batch after 429, 5xx or connection errors (default: {SUBMIT_MAX_RETRIES})")
+
+
+def submit_doordash_csv(file_path, args):
+    """Submit the orders in a DoorDash CSV file as configured by args and print a summary."""
+    submitter = DoorDashSubmitter(args.endpoint, args.results_file or file_path + ".submitted.jsonl",
+                                  token=args.token, batch_size=args.batch_size, max_in_flight=args.max_in_flight,
+                                  max_retries=args.max_retries, log=print)
+    try:
+        with open(file_path, newline='', encoding='utf-8') as f:
+            orders = list(csv.DictReader(f))
+    except Exception as e:
+        raise Exception(f"Error reading DoorDash CSV file: {str(e)}")
+    summary = submitter.submit(orders)
+    print(f"Submission complete! {summary['succeeded']} orders accepted, {summary['failed']} failed, "
+          f"{summary['skipped']} already submitted, {summary['retries']} retries in {summary['duration']:.2f}s.")
+    print(f"Results saved to: {submitter.results_file}")
+    return 1 if summary['failed'] else 0
+
+
+def build_arg_parser():
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="workwave_to_doordash",
+        description="Convert WorkWave Route Manager CSV exports to DoorDash import templates."
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    
+    convert_parser = subparsers.add_parser('convert', help="Convert a WorkWave CSV file without opening the GUI")
+    convert_parser.add_argument('input_file', help="WorkWave CSV file")
+    convert_parser.add_argument('-o', '--output', dest='output_file',
+                                help="DoorDash CSV file (default: <input>_doordash.csv)")
+    convert_parser.add_argument('-j', '--workers', type=int, default=None,
+                                help="Split a large file into chunks converted by this many worker processes")
+    convert_parser.add_argument('--profile', metavar='PATH',
+                                help="Save stage and helper timings as JSON to PATH ('-' for stdout)")
+    convert_parser.add_argument('--incremental', action='store_true',
+                                help="Only reconvert orders changed since the last run and also write "
+                                     "<output>_delta.csv and <output>_removed.csv")
+    convert_parser.add_argument('--manifest', metavar='PATH',
+                                help="Manifest of the last run used by --incremental "
+                                     "(default: <output>.manifest.json)")
+    convert_parser.add_argument('--rejects', nargs='?', const='', metavar='PATH',
+                                help="Leave out rows missing a required DoorDash field or with a malformed date, "
+                                     "state, ZIP or phone and save them with reason codes to PATH "
+                                     "(default: <output>_rejects.csv)")
+    convert_parser.add_argument('--format', dest='formats', action='append', choices=list(OUTPUT_FORMATS), default=[],
+                                help="Also write the orders as <output>.csv.gz, .jsonl or .parquet (needs pyarrow) "
+                                     "in the same pass (can be repeated)")
+    convert_parser.add_argument('--split-by', action='append', choices=PARTITION_KEYS, default=[],
+                                help="Write one file per delivery date and/or pickup location (can be repeated)")
+    convert_parser.add_argument('--max-rows', type=int, default=None,
+                                help="Start a new file after this many orders")
+    convert_parser.add_argument('--max-open-files', type=int, default=DEFAULT_MAX_OPEN_FILES,
+                                help=f"Output files kept open at once when splitting (default: {DEFAULT_MAX_OPEN_FILES})")
+    convert_parser.add_argument('--pickup-location-column', metavar='COLUMN',
+                                help="WorkWave column giving each order's pickup location, e.g. Vehicle or Route")
+    convert_parser.add_argument('--pickup-location', dest='pickup_locations', action='append', default=[],
+                                metavar='VALUE=ID',
+                                help="Pickup location ID for a value of --pickup-location-column (can be repeated)")
+    convert_parser.add_argument('--submit', dest='endpoint', metavar='URL',
+                                help="Submit the converted orders to this DoorDash endpoint")
+    add_submit_arguments(convert_parser)
+    add_converter_arguments(convert_parser)
+    convert_parser.set_defaults(func=cli_convert)
+    
+    batch_parser = subparsers.add_parser('batch', help="Convert many WorkWave CSV files in parallel")
+    batch_parser.add_argument('inputs', nargs='+', help="WorkWave CSV files, directories or glob patterns")
+    batch_parser.add_argument('-o', '--output-dir', dest='output_dir',
+                              help="Directory for the DoorDash CSV files (default: next to each input)")
+    batch_parser.add_argument('-j', '--workers', type=int, default=None,
+                              help="Number of worker processes (default: number of CPUs)")
+    add_converter_arguments(batch_parser)
+    batch_parser.set_defaults(func=cli_batch)
+    
+    merge_parser = subparsers.add_parser('merge', help="Merge several WorkWave CSV files into one DoorDash CSV file")
+    merge_parser.add_argument('inputs', nargs='+', help="WorkWave CSV files, directories or glob patterns, oldest first")
+    merge_parser.add_argument('-o', '--output', dest='output_file', required=True, help="DoorDash CSV file to write")
+    merge_parser.add_argument('--policy', choices=MERGE_POLICIES, default='last',
+                              help="How to resolve an order that differs between files: keep the last file's "
+                                   "version, the latest time window, or flag it and leave it out (default: last)")
+    merge_parser.add_argument('--conflicts', metavar='PATH',
+                              help="Where --policy flag writes the conflicting orders "
+                                   "(default: <output>_conflicts.csv)")
+    add_converter_arguments(merge_parser)
+    merge_parser.set_defaults(func=cli_merge)
+    
+    watch_parser = subparsers.add_parser('watch', help="Convert WorkWave CSV files as they land in a folder")
+    watch_parser.add_argument('input_dir', help="Folder to watch for WorkWave CSV files")
+    watch_parser.add_argument('-o', '--output-dir', dest='output_dir',
+                              help="Folder for the DoorDash CSV files (default: <input_dir>/doordash)")
+    watch_parser.add_argument('-j', '--workers', type=int, default=None,
+                              help="Number of worker processes (default: number of CPUs)")
+    watch_parser.add_argument('--pattern', default='*.csv', help="File name pattern to convert (default: *.csv)")
+    watch_parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS,
+                              help="Seconds a file must stay unchanged before it is converted "
+                                   f"(default: {WATCH_SETTLE_SECONDS})")
+    watch_parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_INTERVAL,
+                              help=f"Seconds between checks of the folder (default: {WATCH_POLL_INTERVAL})")
+    watch_parser.add_argument('--polling', action='store_true', help="Poll the folder instead of using inotify")
+    add_converter_arguments(watch_parser)
+    watch_parser.set_defaults(func=cli_watch)
+    
+    submit_parser = subparsers.add_parser('submit', help="Submit a converted DoorDash CSV file to an HTTP endpoint")
+    submit_parser.add_argument('input_file', help="DoorDash CSV file")
+    submit_parser.add_argument('--endpoint', required=True, metavar='URL', help="URL the orders are POSTed to")
+    add_submit_arguments(submit_parser)
+    submit_parser.set_defaults(func=cli_submit)
+    
+    serve_parser = subparsers.add_parser('serve', help="Run a local HTTP conversion service")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_SERVICE_PORT,
+                              help=f"Port to listen on (default: {DEFAULT_SERVICE_PORT})")
+    serve_parser.add_argument('--max-concurrent', type=int, default=DEFAULT_SERVICE_CONCURRENCY,
+                              help=f"Conversions run at once; more get 503 (default: {DEFAULT_SERVICE_CONCURRENCY})")
+    add_converter_arguments(serve_parser)
+    serve_parser.set_defaults(func=cli_serve)
+    
+    subparsers.add_parser('gui', help="Open the graphical interface (default when no command is given)")
+    return parser
+
+
+def cli_convert(args):
+    """Run the convert command."""
+    if args.cache_path and args.workers is not None and args.workers > 1:
+        raise ValueError("--cache cannot be combined with -j; worker processes run without the cache.")
+    converter = converter_from_args(args)
+    output_file = args.output_file or default_output_path(args.input_file)
+    summary = {}
+    converter.pickup_location_column = args.pickup_location_column
+    for mapping in args.pickup_locations:
+        value, sep, location_id = mapping.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid pickup location: {mapping}")
+        converter.pickup_location_map[value] = location_id
+    partitioned = bool(args.split_by or args.max_rows or args.pickup_location_column)
+    rejects_file = None
+    if args.rejects is not None:
+        if partitioned or args.incremental:
+            raise ValueError("--rejects cannot be combined with split output or --incremental.")
+        rejects_file = args.rejects or rejects_path(output_file)
+    if args.formats and (partitioned or args.incremental):
+        raise ValueError("--format cannot be combined with split output or --incremental.")
+    if args.profile and (partitioned or args.incremental):
+        raise ValueError("--profile cannot be combined with split output or --incremental.")
+    if args.profile:
+        converter.instrumentation = Instrumentation()
+        converter.instrumentation.add_hook(lambda report: write_profile(report, args.profile))
+    try:
+        if partitioned:
+            if args.incremental or args.engine != 'python' or (args.workers is not None and args.workers > 1):
+                raise ValueError("Split output only works with the python engine and a single worker.")
+            files = converter.convert_file_partitioned(args.input_file, output_file, args.split_by, args.max_rows,
+                                                       args.max_open_files, summary=summary)
+            count = summary['rows_out']
+        elif args.incremental:
+            if args.engine != 'python' or (args.workers is not None and args.workers > 1):
+                raise ValueError("--incremental only works with the python engine and a single worker.")
+            manifest_file, delta_file, removed_file = incremental_paths(output_file)
+            count, delta_count, removed_count = converter.convert_file_incremental(
+                args.input_file, output_file, manifest_file=args.manifest, summary=summary)
+        else:
+            count = converter.convert_file(args.input_file, output_file, streaming=args.streaming,
+                                           engine=args.engine, summary=summary, workers=args.workers,
+                                           rejects_file=rejects_file, formats=args.formats)
+    finally:
+        if converter.cache is not None:
+            converter.cache.close()
+    print(f"Conversion complete! {count} orders processed.")
+    if partitioned:
+        for path, rows in files:
+            print(f"{rows:>8} orders saved to: {path}")
+    else:
+        print(f"Output saved to: {output_file}")
+    for output_format in args.formats:
+        print(f"Also saved to: {output_format_path(output_file, output_format)}")
+    if args.incremental:
+        print(f"{summary['rows_converted']} orders reconverted, {count - summary['rows_converted']} reused.")
+        print(f"{delta_count} new or changed orders saved to: {delta_file}")
+        print(f"{removed_count} removed orders saved to: {removed_file}")
+    if rejects_file is not None:
+        print(format_reject_summary(summary, rejects_file))
+    if 'cache_hits' in summary:
+        print(f"Cache: {summary['cache_hits']} hits, {summary['cache_misses']} misses.")
+    if args.endpoint:
+        if partitioned:
+            return max([submit_doordash_csv(path, args) for path, rows in files] or [0])
+        return submit_doordash_csv(output_file, args)
+    return 0
+
+
+def cli_submit(args):
+    """Run the submit command."""
+    return submit_doordash_csv(args.input_file, args)
+
+
+def write_profile(report, path):
+    """Write an instrumentation report as JSON to path, or to stdout if path is '-'."""
+    if path == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def cli_batch(args):
+    """Run the batch command."""
+    if args.cache_path and args.workers != 1:
+        raise ValueError("--cache only works with batch -j 1; worker processes run without the cache.")
+    converter = converter_from_args(args)
+    input_files = expand_input_paths(args.inputs)
+    if not input_files:
+        raise ValueError("No WorkWave CSV files found.")
+    
+    start = time.perf_counter()
+    try:
+        summaries = converter.convert_batch(input_files, args.output_dir, workers=args.workers,
+                                            streaming=args.streaming, engine=args.engine)
+    finally:
+        if converter.cache is not None:
+            converter.cache.close()
+    elapsed = time.perf_counter() - start
+    
+    failed = 0
+    for summary in summaries:
+        if summary['error']:
+            failed += 1
+        print(format_batch_summary(summary))
+    
+    total_orders = sum(summary['rows_out'] for summary in summaries)
+    print(f"Batch complete! {len(summaries) - failed} of {len(summaries)} files converted, "
+          f"{total_orders} orders processed in {elapsed:.2f}s.")
+    if converter.cache is not None and converter.cache.hits + converter.cache.misses:
+        print(f"Cache: {converter.cache.stats()}")
+    return 1 if failed else 0
+
+
+def cli_merge(args):
+    """Run the merge command."""
+    converter = converter_from_args(args)
+    input_files = expand_input_paths(args.inputs)
+    if not input_files:
+        raise ValueError("No WorkWave CSV files found.")
+    
+    summary = {}
+    try:
+        count = converter.convert_files_merged(input_files, args.output_file, policy=args.policy,
+                                               conflicts_file=args.conflicts, summary=summary)
+    finally:
+        if converter.cache is not None:
+            converter.cache.close()
+    print(f"Merge complete! {count} orders from {summary['rows_in']} rows in {len(input_files)} files.")
+    print(f"Output saved to: {args.output_file}")
+    print(f"{summary['duplicates']} duplicate rows, {summary['conflicts']} orders differed between files.")
+    if args.policy == 'flag':
+        print(f"Conflicting orders left out and saved to: {args.conflicts or merge_conflicts_path(args.output_file)}")
+    return 0
+
+
+def cli_watch(args):
+    """Run the watch command until interrupted."""
+    if args.cache_path:
+        raise ValueError("--cache cannot be used with watch; files are converted in worker processes.")
+    converter = converter_from_args(args)
+    watcher = FolderWatcher(converter, args.input_dir, args.output_dir, pattern=args.pattern,
+                            workers=args.workers, settle_seconds=args.settle, poll_interval=args.poll_interval,
+                            polling=args.polling, streaming=args.streaming, engine=args.engine,
+                            log=lambda message: print(message, flush=True))
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    return 0
+
+
+def cli_serve(args):
+    """Run the serve command until interrupted."""
+    import asyncio
+    converter = converter_from_args(args)
+    if converter.cache is not None:
+        # Requests may change the note settings, so the service converts without the cache
+        converter.cache.close()
+        converter.cache = None
+    service = ConversionService(converter, args.host, args.port, args.max_concurrent,
+                                log=lambda message: print(message, flush=True))
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("Stopped serving.")
+    return 0
+
+
+def run_gui():
+    """Run the graphical application."""
+    load_tkinter()
     root = tk.Tk()
     app = ConverterGUI(root)
     root.mainloop()
 
 
+def main(argv=None):
+    """Main function to run the application."""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    
+    if args.command in (None, 'gui'):
+        run_gui()
+        return 0
+    
+    try:
+        return args.func(args)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())